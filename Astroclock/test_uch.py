@@ -0,0 +1,158 @@
+"""
+Sun-times cache against a local stand-in for sunrise-sunset.org, and the
+planetary hour daemon's publishing.
+
+Run with: python -m pytest Astroclock
+"""
+
+import asyncio
+import importlib.machinery
+import importlib.util
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+
+def load_uch():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uch.py.txt")
+    loader = importlib.machinery.SourceFileLoader("uch", path)
+    spec = importlib.util.spec_from_loader("uch", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Answers every date with fixed UTC sun times; dates in fail_dates get a 500."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.requested = []
+        self.fail_dates = set()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        day = parse_qs(urlparse(self.path).query)["date"][0]
+        self.server.requested.append(day)
+        if day in self.server.fail_dates:
+            self.send_error(500)
+            return
+        body = json.dumps({
+            "results": {"sunrise": f"{day}T04:30:00+00:00", "sunset": f"{day}T15:30:00+00:00"},
+            "status": "OK",
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = StandInServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def uch(server, tmp_path):
+    module = load_uch()
+    module.SUN_TIMES_SOURCE = "api"
+    module.SUN_API_URL = f"http://127.0.0.1:{server.server_address[1]}/json"
+    module._sun_cache = module.SunTimesCache(str(tmp_path / "sun_times.sqlite3"))
+    return module
+
+
+def test_repeat_lookups_make_no_requests(uch, server):
+    now = datetime(2024, 6, 21, 12, 0, tzinfo=uch.LOCAL_TZ)
+    first = uch.current_planetary_hour_info(now)
+    assert server.requested
+
+    server.requested.clear()
+    for _ in range(3):
+        assert uch.current_planetary_hour_info(now)[:3] == first[:3]
+    assert server.requested == []
+
+
+def test_sqlite_layer_survives_restart(uch, server, tmp_path):
+    now = datetime(2024, 6, 21, 12, 0, tzinfo=uch.LOCAL_TZ)
+    uch.current_planetary_hour_info(now)
+
+    server.requested.clear()
+    uch._sun_cache = uch.SunTimesCache(str(tmp_path / "sun_times.sqlite3"))
+    uch.current_planetary_hour_info(now)
+    assert server.requested == []
+
+
+def test_prefetch_failure_is_not_fatal(uch, server):
+    server.fail_dates = {"2024-06-23"}
+    sunrise, sunset = uch.get_sun_times_cached(datetime(2024, 6, 21), prefetch_days=7)
+    assert sunrise.isoformat() == "2024-06-21T04:30:00+00:00"
+    assert sunset.isoformat() == "2024-06-21T15:30:00+00:00"
+    assert "2024-06-23" in server.requested
+
+
+def test_requested_day_failure_raises(uch, server):
+    server.fail_dates = {"2024-06-21"}
+    with pytest.raises(OSError):
+        uch.get_sun_times_cached(datetime(2024, 6, 21), prefetch_days=7)
+
+
+class StalledWriter:
+    """TCP writer whose peer never reads: drain() never completes."""
+
+    def __init__(self):
+        self.closed = False
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        await asyncio.Event().wait()
+
+    def close(self):
+        self.closed = True
+
+
+def test_publish_survives_failing_subscriber_and_stalled_client():
+    uch = load_uch()
+    uch.CLIENT_DRAIN_TIMEOUT = 0.05
+    clock = uch.PlanetaryHourClock()
+    received = []
+
+    def broken(event):
+        raise RuntimeError("subscriber bug")
+
+    clock.subscribe(broken)
+    clock.subscribe(received.append)
+    stalled = StalledWriter()
+    clock._clients.add(stalled)
+
+    asyncio.run(clock._publish({"planet": "Sun"}))
+    assert received == [{"planet": "Sun"}]
+    assert stalled.closed and stalled not in clock._clients
+
+
+def test_clock_event_matches_schedule_lookup():
+    uch = load_uch()
+    clock = uch.PlanetaryHourClock()
+    now = datetime(2024, 6, 21, 12, 0, tzinfo=uch.LOCAL_TZ)
+    clock._schedule = clock._build_schedule(now)
+    ruler, hour_index, next_change = clock._schedule.lookup(now)
+    event = clock._event(now.timestamp())
+    assert event["planet"] == uch.PLANETS[int(ruler)]
+    assert event["hour_index_0_based"] == int(hour_index)
+    assert event["next_change_epoch"] == float(next_change)
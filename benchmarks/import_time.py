@@ -0,0 +1,59 @@
+"""
+Startup-time benchmark: import the package modules in a fresh interpreter
+and fail if it takes longer than the budget or pulls in SciPy/matplotlib.
+
+Usage: python benchmarks/import_time.py [--budget MS] [--runs N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Milliseconds allowed for `import commtheory.mtc, commtheory.dspssr`
+IMPORT_BUDGET_MS = 300
+
+HEAVY_MODULES = ("scipy", "matplotlib")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, time
+t = time.perf_counter()
+import commtheory.mtc, commtheory.dspssr
+ms = (time.perf_counter() - t) * 1000
+heavy = sorted({m.split('.')[0] for m in sys.modules if m.split('.')[0] in %r})
+print(ms, ','.join(heavy))
+""" % (HEAVY_MODULES,)
+
+
+def measure(runs):
+    """Best import time in ms over fresh interpreters, and heavy modules seen."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    best = float("inf")
+    heavy = set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", CHILD], env=env, check=True,
+                             capture_output=True, text=True).stdout.split()
+        best = min(best, float(out[0]))
+        if len(out) > 1:
+            heavy.update(out[1].split(","))
+    return best, sorted(heavy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check package import time against a budget")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="budget in ms")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to try (best is kept)")
+    args = parser.parse_args()
+
+    ms, heavy = measure(args.runs)
+    print(f"import commtheory.mtc, commtheory.dspssr: {ms:.1f} ms (budget {args.budget:.0f} ms)")
+    if heavy:
+        print("eagerly imported:", ", ".join(heavy))
+    if ms > args.budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Information theory toolkit (mtc) and speech DSP library (dspssr).
+
+Submodules and the toolkit classes are loaded on first attribute access,
+so `import commtheory` itself costs almost nothing.
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+_EXPORTS = {
+    "InformationTheory": "mtc",
+    "DiscreteChannel": "mtc",
+    "ChannelSimulator": "mtc",
+    "ContinuousChannel": "mtc",
+    "SourceCoding": "mtc",
+    "HuffmanCodec": "mtc",
+    "TextAnalysis": "mtc",
+    "Visualization": "mtc",
+    "OnlineVQ": "dspssr",
+}
+
+__all__ = ["mtc", "dspssr"] + list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in ("mtc", "dspssr"):
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
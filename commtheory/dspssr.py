@@ -0,0 +1,392 @@
+# furui_dsp_library.py (revised)
+# A Python library inspired by Sadao Furui's "Digital Speech Processing, Synthesis, and Recognition"
+# Implements key algorithms and functions for educational purposes.
+# Requires: numpy, scipy (both standard in most environments)
+# SciPy is imported inside the functions that use it, so importing this module only loads numpy.
+# Revisions: Removed HMM function due to dependency on unavailable 'hmmlearn'; minor docstring enhancements; added zero-check in pitch detection.
+
+import numpy as np
+
+from .instrument import instrumented
+
+def speech_production_model(amplitude=1.0, frequency=100, duration=1.0, fs=16000):
+    """
+    Simple speech production model simulation (e.g., glottal pulse approximation).
+    Based on Chapter 2: Speech Production Models.
+    Generates a basic voiced sound waveform.
+    
+    Args:
+        amplitude (float): Signal amplitude.
+        frequency (float): Fundamental frequency (pitch).
+        duration (float): Duration in seconds.
+        fs (int): Sampling frequency.
+    
+    Returns:
+        np.ndarray: Simulated speech waveform.
+    """
+    t = np.linspace(0, duration, int(fs * duration))
+    waveform = amplitude * np.sin(2 * np.pi * frequency * t)
+    return waveform
+
+def pitch_detection_autocorr(signal, fs=16000, min_freq=80, max_freq=300):
+    """
+    Basic pitch detection using autocorrelation.
+    Based on Chapter 2: Characteristics of Speech Signals.
+    Finds fundamental frequency (pitch) for voiced segments.
+    
+    Args:
+        signal (np.ndarray): Input speech frame.
+        fs (int): Sampling frequency.
+        min_freq (float): Minimum expected pitch (Hz).
+        max_freq (float): Maximum expected pitch (Hz).
+    
+    Returns:
+        float: Estimated pitch frequency, or 0 if unvoiced.
+    """
+    autocorr = np.correlate(signal, signal, mode='full')[len(signal):]
+    max_auto = np.max(autocorr)
+    if max_auto == 0:
+        return 0.0
+    autocorr = autocorr / max_auto  # Normalize
+    min_lag = int(fs / max_freq)
+    max_lag = int(fs / min_freq)
+    peak_lag = np.argmax(autocorr[min_lag:max_lag]) + min_lag
+    if autocorr[peak_lag] < 0.5:  # Threshold for voiced/unvoiced
+        return 0.0
+    return fs / peak_lag
+
+@instrumented
+def lpc_analysis(signal, order=12, preemphasis=0.97):
+    """
+    Linear Predictive Coding (LPC) analysis.
+    Based on Chapter 4: Linear Predictive Coding (LPC).
+    Computes LPC coefficients using autocorrelation and Levinson-Durbin recursion.
+    
+    Args:
+        signal (np.ndarray): Input speech frame (e.g., windowed segment).
+        order (int): LPC order (number of coefficients).
+        preemphasis (float): Pre-emphasis factor (set to 0 to disable).
+    
+    Returns:
+        np.ndarray: LPC coefficients.
+    """
+    from scipy.linalg import toeplitz
+
+    if preemphasis > 0:
+        signal = np.append(signal[0], signal[1:] - preemphasis * signal[:-1])
+    
+    # Autocorrelation
+    autocorr = np.correlate(signal, signal, mode='full')[len(signal)-1:]
+    R = toeplitz(autocorr[:order])
+    r = autocorr[1:order+1]
+    
+    # Levinson-Durbin recursion (via matrix solve)
+    a = np.linalg.solve(R, r)
+    a = np.insert(-a, 0, 1.0)  # Include a0 = 1
+    return a
+
+def lpc_synthesis(excitation, lpc_coeffs, gain=1.0):
+    """
+    LPC-based speech synthesis (analysis-synthesis method).
+    Based on Chapter 3: Speech Analysis and Analysis-Synthesis Systems.
+    Reconstructs signal using LPC filter on excitation source.
+    
+    Args:
+        excitation (np.ndarray): Excitation signal (e.g., noise for unvoiced, pulse for voiced).
+        lpc_coeffs (np.ndarray): LPC coefficients.
+        gain (float): Gain factor.
+    
+    Returns:
+        np.ndarray: Synthesized speech signal.
+    """
+    from scipy.signal import lfilter
+
+    synthesized = gain * lfilter([1], lpc_coeffs, excitation)
+    return synthesized
+
+def waveform_coding_synthesis(original_signal, bit_rate_reduction_factor=2):
+    """
+    Basic waveform coding for synthesis.
+    Based on Chapter 7: Synthesis Based on Waveform Coding.
+    Simplifies by downsampling and upsampling (e.g., ADPCM-like approximation).
+    
+    Args:
+        original_signal (np.ndarray): Input waveform.
+        bit_rate_reduction_factor (int): Factor for reducing sample rate (simulates compression).
+    
+    Returns:
+        np.ndarray: Reconstructed waveform.
+    """
+    from scipy.signal import resample
+
+    downsampled = resample(original_signal, len(original_signal) // bit_rate_reduction_factor)
+    reconstructed = resample(downsampled, len(original_signal))
+    return reconstructed
+
+def cepstral_analysis(signal, n_ceps=13):
+    """
+    Cepstral analysis for feature extraction (used in recognition).
+    Based on recognition chapters (e.g., MFCC-like, but simplified homomorphic cepstrum).
+    
+    Args:
+        signal (np.ndarray): Input speech frame.
+        n_ceps (int): Number of cepstral coefficients.
+    
+    Returns:
+        np.ndarray: Cepstral coefficients.
+    """
+    spectrum = np.fft.fft(signal)
+    log_spectrum = np.log(np.abs(spectrum) + 1e-10)
+    cepstrum = np.fft.ifft(log_spectrum).real
+    return cepstrum[:n_ceps]
+
+@instrumented
+def train_vq_codebook(features, codebook_size=256, max_iter=100, tol=1e-4):
+    """
+    Basic Vector Quantization (VQ) codebook training using k-means-like algorithm.
+    Based on Appendix C: Vector Quantization Algorithm.
+    Trains a codebook from feature vectors.
+    
+    Args:
+        features (np.ndarray): Feature vectors (M x D array).
+        codebook_size (int): Number of codebook entries.
+        max_iter (int): Maximum iterations.
+        tol (float): Convergence tolerance.
+    
+    Returns:
+        np.ndarray: Trained codebook (codebook_size x D).
+    """
+    codebook = features[np.random.choice(len(features), codebook_size, replace=False)]
+    for _ in range(max_iter):
+        distances = np.linalg.norm(features[:, np.newaxis] - codebook, axis=2)
+        labels = np.argmin(distances, axis=1)
+        new_codebook = np.array([features[labels == k].mean(axis=0) if np.sum(labels == k) > 0 else codebook[k] for k in range(codebook_size)])
+        if np.linalg.norm(new_codebook - codebook) < tol:
+            break
+        codebook = new_codebook
+    return codebook
+
+@instrumented(size=lambda codebook, features: np.size(features))
+def vector_quantization(codebook, features):
+    """
+    Vector Quantization (VQ) for compression/recognition.
+    Based on Appendix C: Vector Quantization Algorithm.
+    Finds nearest codebook entry for each feature vector.
+    
+    Args:
+        codebook (np.ndarray): Pre-trained codebook (N x D array).
+        features (np.ndarray): Feature vectors (M x D array).
+    
+    Returns:
+        np.ndarray: Quantized indices.
+    """
+    distances = np.linalg.norm(features[:, np.newaxis] - codebook, axis=2)
+    indices = np.argmin(distances, axis=1)
+    return indices
+
+class OnlineVQ:
+    """
+    Streaming vector quantizer with incremental codebook adaptation.
+    Based on Appendix C: Vector Quantization Algorithm (sequential k-means variant).
+    Each feature block is quantized against the current codebook, and each
+    codeword then moves towards the mean of its assigned vectors with rate
+    m / (n + m), where m is its hit count in the block and n its decayed
+    running count. Because counts decay by `forgetting` per vector, the rate
+    falls like 1/n at first and then levels off near (1 - forgetting), so the
+    codebook keeps tracking speaker or channel drift.
+    Codewords whose decayed count falls below `dead_fraction` of the average
+    are merged into their nearest neighbour. The freed slot then splits the
+    codeword with the largest accumulated distortion.
+    All state is held in fixed-size (codebook_size,) and (codebook_size x D)
+    arrays. An update costs O(block), and memory does not depend on the
+    stream length.
+
+    Attributes:
+        codebook (np.ndarray): Current codebook (codebook_size x D).
+        counts (np.ndarray): Decayed number of vectors assigned per codeword.
+        distortion (np.ndarray): Decayed sum of squared error per codeword.
+        n_seen (int): Number of vectors processed.
+    """
+
+    def __init__(self, codebook=None, codebook_size=256, dim=None,
+                 forgetting=0.999, dead_fraction=0.01, split_scale=0.01, seed=None):
+        """
+        Args:
+            codebook (np.ndarray): Initial codebook (N x D), e.g. from train_vq_codebook.
+                If None, the first codebook_size vectors of the stream are used.
+            codebook_size (int): Number of codebook entries (ignored if codebook is given).
+            dim (int): Feature dimension (inferred from the first block if None).
+            forgetting (float): Per-vector decay of counts and distortion, in (0, 1].
+            dead_fraction (float): A codeword is dead when its count is below this
+                fraction of the mean count.
+            split_scale (float): Size of the split perturbation relative to the
+                RMS error of the codeword being split.
+            seed (int): Seed for the split perturbations.
+        """
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.forgetting = forgetting
+        self.dead_fraction = dead_fraction
+        self.split_scale = split_scale
+        self.rng = np.random.default_rng(seed)
+        self.n_seen = 0
+        if codebook is not None:
+            codebook = np.array(codebook, dtype=float, ndmin=2)
+            self.codebook_size = len(codebook)
+            self._allocate(codebook.shape[1])
+            self.codebook[:] = codebook
+            self.filled = self.codebook_size
+            # A given codebook starts at the saturated count, i.e. the floor rate
+            prior = 1.0 / (1.0 - forgetting) if forgetting < 1 else 1.0
+            self.counts[:] = prior / self.codebook_size
+        else:
+            self.codebook_size = codebook_size
+            self.filled = 0
+            self.codebook = None
+            if dim is not None:
+                self._allocate(dim)
+
+    def _allocate(self, dim):
+        self.codebook = np.zeros((self.codebook_size, dim))
+        self.counts = np.zeros(self.codebook_size)
+        self.distortion = np.zeros(self.codebook_size)
+
+    def _nearest(self, features):
+        """Indices of and squared distances to the nearest active codewords."""
+        active = self.codebook[:self.filled]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2 needs an M x N array, not M x N x D
+        scores = (active * active).sum(axis=1) - 2.0 * (features @ active.T)
+        indices = np.argmin(scores, axis=1)
+        errors = scores[np.arange(len(features)), indices] + (features * features).sum(axis=1)
+        return indices, np.maximum(errors, 0.0)
+
+    def _as_block(self, features):
+        features = np.array(features, dtype=float, ndmin=2)
+        if self.codebook is None:
+            self._allocate(features.shape[1])
+        if features.shape[1] != self.codebook.shape[1]:
+            raise ValueError(f"expected {self.codebook.shape[1]}-dimensional features, "
+                             f"got {features.shape[1]}")
+        return features
+
+    def quantize(self, features):
+        """
+        Quantize a block without changing the codebook.
+
+        Args:
+            features (np.ndarray): Feature vectors (M x D array).
+
+        Returns:
+            np.ndarray: Quantized indices.
+        """
+        features = self._as_block(features)
+        if self.filled == 0:
+            raise ValueError("codebook is empty; call partial_fit first")
+        return self._nearest(features)[0]
+
+    @instrumented(size=lambda self, features: np.size(features))
+    def partial_fit(self, features):
+        """
+        Quantize a block, then adapt the codebook to it.
+        Vectors within the block are assigned against the codebook as it was
+        before the block, so an update is a single vectorized pass.
+
+        Args:
+            features (np.ndarray): Feature vectors (M x D array).
+
+        Returns:
+            np.ndarray: Quantized indices (w.r.t. the codebook before the update).
+        """
+        features = self._as_block(features)
+        if len(features) == 0:
+            return np.zeros(0, dtype=int)
+        if self.filled < self.codebook_size:
+            # Seed empty slots from the stream
+            take = min(self.codebook_size - self.filled, len(features))
+            self.codebook[self.filled:self.filled + take] = features[:take]
+            self.filled += take
+
+        indices, errors = self._nearest(features)
+        n = self.filled
+        hits = np.bincount(indices, minlength=n).astype(float)
+        order = np.argsort(indices, kind="stable")
+        used = hits > 0
+        starts = np.concatenate(([0], np.cumsum(hits[used])[:-1])).astype(int)
+        sums = np.add.reduceat(features[order], starts, axis=0)
+
+        decay = self.forgetting ** len(features)
+        counts = self.counts[:n]
+        counts *= decay
+        self.distortion[:n] *= decay
+        rates = hits[used] / (counts[used] + hits[used])
+        block_means = sums / hits[used, np.newaxis]
+        self.codebook[:n][used] += rates[:, np.newaxis] * (block_means - self.codebook[:n][used])
+        counts += hits
+        self.distortion[:n] += np.bincount(indices, weights=errors, minlength=n)
+        self.n_seen += len(features)
+
+        if self.filled == self.codebook_size:
+            self._replace_dead()
+        return indices
+
+    def _replace_dead(self):
+        """Merge dead codewords into their neighbours and split the worst codewords."""
+        threshold = self.dead_fraction * self.counts.mean()
+        dead = np.flatnonzero(self.counts < threshold)
+        if len(dead) == 0 or len(dead) == self.codebook_size:
+            return
+        for k in dead:
+            # Merge: the nearest other codeword absorbs k's statistics
+            gaps = ((self.codebook - self.codebook[k]) ** 2).sum(axis=1)
+            gaps[k] = np.inf
+            nearest = np.argmin(gaps)
+            self.counts[nearest] += self.counts[k]
+            self.distortion[nearest] += self.distortion[k]
+
+            # Split: the slot becomes a perturbed copy of the highest-distortion codeword
+            self.counts[k] = 0.0
+            self.distortion[k] = 0.0
+            worst = np.argmax(self.distortion)
+            if self.counts[worst] == 0:
+                continue
+            dim = self.codebook.shape[1]
+            rms = np.sqrt(self.distortion[worst] / self.counts[worst] / dim)
+            offset = self.split_scale * max(rms, 1e-12) * self.rng.standard_normal(dim)
+            self.codebook[k] = self.codebook[worst] + offset
+            self.codebook[worst] -= offset
+            self.counts[worst] /= 2
+            self.distortion[worst] /= 2
+            self.counts[k] = self.counts[worst]
+            self.distortion[k] = self.distortion[worst]
+
+    def mean_distortion(self):
+        """
+        Recent mean squared error per codeword.
+
+        Returns:
+            np.ndarray: Decayed distortion / decayed count (0 for unused codewords).
+        """
+        counts = self.counts[:self.filled]
+        return np.divide(self.distortion[:self.filled], counts,
+                         out=np.zeros_like(counts), where=counts > 0)
+
+def main():
+    """Example usage (the `dspssr-demo` command)."""
+    fs = 16000
+    signal = speech_production_model(frequency=120, duration=0.1, fs=fs)
+    pitch = pitch_detection_autocorr(signal, fs=fs)
+    print("Estimated pitch:", pitch)
+    lpc_coeffs = lpc_analysis(signal)
+    synthesized = lpc_synthesis(np.random.randn(len(signal)), lpc_coeffs)
+    print("Synthesized signal:", synthesized[:10])
+    features = np.random.randn(100, 13)  # Dummy cepstral features
+    codebook = train_vq_codebook(features, codebook_size=8)
+    indices = vector_quantization(codebook, features)
+    print("VQ indices:", indices[:5])
+    online = OnlineVQ(codebook=codebook)
+    for block in np.array_split(np.random.randn(1000, 13) + 0.5, 10):  # Drifted features
+        online.partial_fit(block)
+    print("Online VQ indices:", online.quantize(features)[:5])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Opt-in hot-path instrumentation.
+
+Functions decorated with @instrumented record call counts, cumulative and
+percentile latencies, input sizes and (optionally) peak temporary allocation.
+Recording is off by default; turn it on with
+
+    COMMTHEORY_INSTRUMENT=1        timings and input sizes
+    COMMTHEORY_INSTRUMENT=memory   also peak allocation via tracemalloc
+
+or for a block of code with `with recording(): ...`. While off, a decorated
+function costs one flag check per call.
+
+snapshot() returns the statistics as a dict; to_json() and to_prometheus()
+format them for export. If COMMTHEORY_INSTRUMENT_OUT names a file, a snapshot
+is written there at exit (Prometheus text for *.prom, JSON otherwise).
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Latest samples kept per function for percentiles
+RESERVOIR_SIZE = 2048
+
+PERCENTILES = (50, 90, 99)
+
+
+class _State:
+    enabled = False
+    memory = False
+    # True when enable() started tracemalloc and disable() should stop it
+    owns_tracing = False
+
+
+_state = _State()
+_HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+
+
+class _FunctionStats:
+    __slots__ = ("calls", "total", "max", "samples", "next_sample",
+                 "size_total", "size_max", "peak_alloc")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self.next_sample = 0
+        self.size_total = 0
+        self.size_max = 0
+        self.peak_alloc = None
+
+    def add(self, seconds, size, peak_alloc):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            self.samples[self.next_sample] = seconds
+            self.next_sample = (self.next_sample + 1) % RESERVOIR_SIZE
+        if size is not None:
+            self.size_total += size
+            self.size_max = max(self.size_max, size)
+        if peak_alloc is not None:
+            self.peak_alloc = max(self.peak_alloc or 0, peak_alloc)
+
+    def as_dict(self):
+        ordered = sorted(self.samples)
+        result = {
+            "calls": self.calls,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.calls if self.calls else 0.0,
+            "max_seconds": self.max,
+            "input_size_total": self.size_total,
+            "input_size_max": self.size_max,
+            "peak_alloc_bytes": self.peak_alloc,
+        }
+        for q in PERCENTILES:
+            # nearest-rank percentile over the recent samples
+            rank = max(int(round(q / 100 * len(ordered))) - 1, 0)
+            result[f"p{q}_seconds"] = ordered[rank] if ordered else 0.0
+        return result
+
+
+def _default_size(*args, **kwargs):
+    """Size of the first positional argument: .size for arrays, else len()."""
+    if not args:
+        return None
+    first = args[0]
+    size = getattr(first, "size", None)
+    if isinstance(size, int):
+        return size
+    try:
+        return len(first)
+    except TypeError:
+        return None
+
+
+def enable(memory=False):
+    """Start recording; memory=True also tracks peak allocation with tracemalloc."""
+    _state.enabled = True
+    _state.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _state.owns_tracing = True
+
+
+def disable():
+    """Stop recording (collected statistics are kept)."""
+    _state.enabled = False
+    _state.memory = False
+    if _state.owns_tracing:
+        tracemalloc.stop()
+        _state.owns_tracing = False
+
+
+def is_enabled():
+    return _state.enabled
+
+
+@contextlib.contextmanager
+def recording(memory=False):
+    """Record instrumented calls inside the block, then restore the previous setting."""
+    previous = (_state.enabled, _state.memory, _state.owns_tracing)
+    started_tracing = memory and not tracemalloc.is_tracing()
+    enable(memory)
+    try:
+        yield
+    finally:
+        _state.enabled, _state.memory, _state.owns_tracing = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def reset():
+    """Drop all collected statistics."""
+    with _lock:
+        _stats.clear()
+
+
+def instrumented(func=None, *, name=None, size=_default_size):
+    """
+    Decorator recording calls of func while instrumentation is enabled.
+
+    Args:
+        name: Metric name (default: module.qualname without the package prefix)
+        size: Callable taking the call's arguments and returning its input
+              size, or None to skip size recording
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name, size=size)
+
+    if name is None:
+        name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _state.enabled:
+            return func(*args, **kwargs)
+        return _record(name, func, size, args, kwargs)
+
+    return wrapper
+
+
+def _record(name, func, size, args, kwargs):
+    n = size(*args, **kwargs) if size is not None else None
+    # tracemalloc.reset_peak() is Python 3.9+; on 3.8 only timings are kept
+    track_memory = _state.memory and _HAS_RESET_PEAK and tracemalloc.is_tracing()
+    if track_memory:
+        # Nested instrumented calls reset tracemalloc's peak, so each
+        # frame keeps the highest absolute level seen by its callees
+        stack = getattr(_local, "peaks", None)
+        if stack is None:
+            stack = _local.peaks = []
+        current, peak_so_far = tracemalloc.get_traced_memory()
+        if stack:
+            # save the caller's peak before reset_peak() discards it
+            stack[-1] = max(stack[-1], peak_so_far)
+        baseline = current
+        tracemalloc.reset_peak()
+        stack.append(baseline)
+
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak_alloc = None
+        if track_memory:
+            inner_peak = stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], inner_peak)
+            peak_alloc = peak - baseline
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+        with _lock:
+            stats = _stats.get(name)
+            if stats is None:
+                stats = _stats[name] = _FunctionStats()
+            stats.add(elapsed, n, peak_alloc)
+
+
+def snapshot():
+    """Current statistics as {function name: {metric: value}}."""
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(_stats.items())}
+
+
+def to_json(indent=2):
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_prometheus(prefix="commtheory"):
+    """Statistics in the Prometheus text exposition format."""
+    snap = snapshot()
+    lines = []
+
+    def family(metric, kind, help_text, rows):
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} {kind}")
+        lines.extend(rows)
+
+    def label(fn, extra=""):
+        return f'{{function="{fn}"{extra}}}'
+
+    family("calls_total", "counter", "Calls per instrumented function.",
+           [f"{prefix}_calls_total{label(fn)} {s['calls']}" for fn, s in snap.items()])
+
+    rows = []
+    for fn, s in snap.items():
+        for q in PERCENTILES:
+            quantile = ',quantile="%s"' % (q / 100)
+            rows.append(f"{prefix}_latency_seconds{label(fn, quantile)} {s[f'p{q}_seconds']!r}")
+        rows.append(f"{prefix}_latency_seconds_sum{label(fn)} {s['total_seconds']!r}")
+        rows.append(f"{prefix}_latency_seconds_count{label(fn)} {s['calls']}")
+    family("latency_seconds", "summary", "Call latency.", rows)
+
+    family("input_size_total", "counter", "Sum of input sizes (elements).",
+           [f"{prefix}_input_size_total{label(fn)} {s['input_size_total']}" for fn, s in snap.items()])
+    family("input_size_max", "gauge", "Largest input size (elements).",
+           [f"{prefix}_input_size_max{label(fn)} {s['input_size_max']}" for fn, s in snap.items()])
+    family("peak_alloc_bytes", "gauge", "Largest peak temporary allocation per call.",
+           [f"{prefix}_peak_alloc_bytes{label(fn)} {s['peak_alloc_bytes']}"
+            for fn, s in snap.items() if s["peak_alloc_bytes"] is not None])
+    return "\n".join(lines) + "\n"
+
+
+def _write_at_exit(path):
+    if not _stats:
+        return
+    with open(path, "w") as f:
+        f.write(to_prometheus() if path.endswith(".prom") else to_json())
+
+
+_mode = os.environ.get("COMMTHEORY_INSTRUMENT", "").strip().lower()
+if _mode in ("1", "true", "yes", "on", "memory"):
+    enable(memory=_mode == "memory")
+if os.environ.get("COMMTHEORY_INSTRUMENT_OUT"):
+    atexit.register(_write_at_exit, os.environ["COMMTHEORY_INSTRUMENT_OUT"])
@@ -0,0 +1,1641 @@
+"""
+Shannon Information Theory Toolkit
+Based on "The Mathematical Theory of Communication" by Shannon & Weaver
+
+This module implements the key mathematical concepts from information theory.
+Only numpy is imported up front; matplotlib is imported by the plotting
+functions when they are first called.
+"""
+
+import argparse
+import numpy as np
+from typing import List, Dict, Tuple, Union
+from collections import Counter
+import itertools
+import os
+import warnings
+
+from .instrument import instrumented
+
+
+class InformationTheory:
+    """Core information theory calculations."""
+
+    @staticmethod
+    def entropy(probabilities: List[float], base: int = 2) -> float:
+        """
+        Calculate Shannon entropy H = -∑ p_i log(p_i)
+    
+        Args:
+            probabilities: List of probabilities (must sum to 1)
+            base: Logarithm base (2 for bits, e for nats)
+        
+        Returns:
+            Entropy in bits (or nats if base=e)
+        
+        Example:
+            >>> InformationTheory.entropy([0.5, 0.5])  # Fair coin
+            1.0
+            >>> InformationTheory.entropy([0.9, 0.1])  # Biased coin
+            0.469
+        """
+        probs = np.array(probabilities)
+        # Remove zeros to avoid log(0)
+        probs = probs[probs > 0]
+    
+        if base == 2:
+            return -np.sum(probs * np.log2(probs))
+        elif base == np.e:
+            return -np.sum(probs * np.log(probs))
+        else:
+            return -np.sum(probs * np.log(probs) / np.log(base))
+
+    @staticmethod
+    def information_content(probability: float, base: int = 2) -> float:
+        """
+        Calculate information content I(p) = -log(p) = log(1/p)
+    
+        Args:
+            probability: Probability of the event
+            base: Logarithm base (2 for bits)
+        
+        Returns:
+            Information content in bits
+        
+        Example:
+            >>> InformationTheory.information_content(0.5)  # Fair coin
+            1.0
+            >>> InformationTheory.information_content(0.25)  # One outcome of fair die
+            2.0
+        """
+        if probability <= 0 or probability > 1:
+            raise ValueError("Probability must be in (0, 1]")
+    
+        if base == 2:
+            return -np.log2(probability)
+        elif base == np.e:
+            return -np.log(probability)
+        else:
+            return -np.log(probability) / np.log(base)
+
+    @staticmethod
+    def joint_entropy(joint_probs: np.ndarray, base: int = 2) -> float:
+        """
+        Calculate joint entropy H(X,Y) = -∑∑ p(x_i, y_j) log p(x_i, y_j)
+    
+        Args:
+            joint_probs: 2D array of joint probabilities
+            base: Logarithm base
+        
+        Returns:
+            Joint entropy in bits
+        
+        Example:
+            >>> # Two independent fair coins
+            >>> probs = np.array([[0.25, 0.25], [0.25, 0.25]])
+            >>> InformationTheory.joint_entropy(probs)
+            2.0
+        """
+        probs = joint_probs[joint_probs > 0]
+        if base == 2:
+            return -np.sum(probs * np.log2(probs))
+        else:
+            return -np.sum(probs * np.log(probs) / np.log(base))
+
+    @staticmethod
+    def conditional_entropy(joint_probs: np.ndarray, base: int = 2) -> Tuple[float, float]:
+        """
+        Calculate conditional entropies H(Y|X) and H(X|Y)
+        Using: H(Y|X) = H(X,Y) - H(X)
+    
+        Args:
+            joint_probs: 2D array of joint probabilities
+            base: Logarithm base
+        
+        Returns:
+            Tuple of (H(Y|X), H(X|Y))
+        
+        Example:
+            >>> # Independent coins
+            >>> probs = np.array([[0.25, 0.25], [0.25, 0.25]])
+            >>> InformationTheory.conditional_entropy(probs)
+            (1.0, 1.0)  # Knowing one gives no info about the other
+        """
+        h_xy = InformationTheory.joint_entropy(joint_probs, base)
+    
+        # Marginal probabilities
+        p_x = joint_probs.sum(axis=1)  # Sum over columns
+        p_y = joint_probs.sum(axis=0)  # Sum over rows
+    
+        h_x = InformationTheory.entropy(p_x, base)
+        h_y = InformationTheory.entropy(p_y, base)
+    
+        h_y_given_x = h_xy - h_x
+        h_x_given_y = h_xy - h_y
+    
+        return h_y_given_x, h_x_given_y
+
+    @staticmethod
+    def mutual_information(joint_probs: np.ndarray, base: int = 2) -> float:
+        """
+        Calculate mutual information I(X;Y) = H(X) + H(Y) - H(X,Y)
+    
+        This measures how much information X and Y share.
+    
+        Args:
+            joint_probs: 2D array of joint probabilities
+            base: Logarithm base
+        
+        Returns:
+            Mutual information in bits
+        
+        Example:
+            >>> # Identical variables (Y = X)
+            >>> probs = np.array([[0.5, 0], [0, 0.5]])
+            >>> InformationTheory.mutual_information(probs)
+            1.0  # They share all their information
+        """
+        h_xy = InformationTheory.joint_entropy(joint_probs, base)
+    
+        p_x = joint_probs.sum(axis=1)
+        p_y = joint_probs.sum(axis=0)
+    
+        h_x = InformationTheory.entropy(p_x, base)
+        h_y = InformationTheory.entropy(p_y, base)
+    
+        return h_x + h_y - h_xy
+
+    @staticmethod
+    def max_entropy(n_symbols: int, base: int = 2) -> float:
+        """
+        Calculate maximum possible entropy for n symbols.
+        Maximum occurs when all symbols are equally likely.
+    
+        H_max = log(n)
+    
+        Args:
+            n_symbols: Number of symbols in alphabet
+            base: Logarithm base
+        
+        Returns:
+            Maximum entropy in bits
+        """
+        if base == 2:
+            return np.log2(n_symbols)
+        else:
+            return np.log(n_symbols) / np.log(base)
+
+    @staticmethod
+    def redundancy(probabilities: List[float]) -> float:
+        """
+        Calculate redundancy = (H_max - H) / H_max
+    
+        Shannon's measure of how much "extra" structure exists
+        beyond random selection.
+    
+        Args:
+            probabilities: List of symbol probabilities
+        
+        Returns:
+            Redundancy as a fraction (0 to 1)
+        
+        Example:
+            >>> # English has ~73% redundancy
+            >>> InformationTheory.redundancy([0.5, 0.25, 0.125, 0.125])
+            0.125  # 12.5% redundancy
+        """
+        h = InformationTheory.entropy(probabilities)
+        h_max = InformationTheory.max_entropy(len(probabilities))
+        return (h_max - h) / h_max
+
+    @staticmethod
+    def _neg_xlogx_sum(probs: np.ndarray, axis, base: float,
+                       out: np.ndarray = None) -> np.ndarray:
+        """
+        -∑ p log p over the given axes, with 0 log 0 = 0.
+    
+        Zeros are clamped to the smallest normal float before the log, so
+        p log p is exactly 0 for them without masking or compacting the
+        data. Uses a single temporary the size of probs.
+        """
+        probs = np.asarray(probs, dtype=float)
+        tmp = np.maximum(probs, np.finfo(float).tiny)
+        if base == 2:
+            np.log2(tmp, out=tmp)
+        else:
+            np.log(tmp, out=tmp)
+            if base != np.e:
+                tmp /= np.log(base)
+        tmp *= probs
+        out = np.sum(tmp, axis=axis, out=out)
+        out *= -1
+        out += 0.0  # no -0.0 for deterministic distributions
+        return out
+
+    @staticmethod
+    def entropy_batch(probabilities: np.ndarray, base: int = 2, axis: int = -1,
+                      out: np.ndarray = None) -> np.ndarray:
+        """
+        Shannon entropy of many distributions at once.
+    
+        Args:
+            probabilities: Array shaped (..., n), one distribution along axis
+            base: Logarithm base (2 for bits, e for nats)
+            axis: Axis holding the probabilities
+            out: Optional output array shaped like probabilities without axis
+        
+        Returns:
+            Entropies shaped (...)
+        
+        Example:
+            >>> InformationTheory.entropy_batch([[0.5, 0.5], [1.0, 0.0]])
+            array([1., 0.])
+        """
+        return InformationTheory._neg_xlogx_sum(probabilities, axis, base, out)
+
+    @staticmethod
+    def joint_entropy_batch(joint_probs: np.ndarray, base: int = 2,
+                            out: np.ndarray = None) -> np.ndarray:
+        """
+        Joint entropy H(X,Y) of a stack of joint distributions.
+    
+        Args:
+            joint_probs: Array shaped (..., n, m)
+            base: Logarithm base
+            out: Optional output array shaped (...)
+        
+        Returns:
+            Joint entropies shaped (...)
+        """
+        return InformationTheory._neg_xlogx_sum(joint_probs, (-2, -1), base, out)
+
+    @staticmethod
+    def conditional_entropy_batch(joint_probs: np.ndarray, base: int = 2,
+                                  out: Tuple[np.ndarray, np.ndarray] = None
+                                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Conditional entropies H(Y|X) and H(X|Y) of a stack of joint distributions.
+    
+        Args:
+            joint_probs: Array shaped (..., n, m), X along n and Y along m
+            base: Logarithm base
+            out: Optional pair of output arrays shaped (...)
+        
+        Returns:
+            Tuple of (H(Y|X), H(X|Y)), each shaped (...)
+        """
+        joint_probs = np.asarray(joint_probs, dtype=float)
+        h_y_given_x, h_x_given_y = out if out is not None else (None, None)
+        h_xy = InformationTheory.joint_entropy_batch(joint_probs, base)
+    
+        h_y_given_x = InformationTheory.entropy_batch(joint_probs.sum(axis=-1), base, out=h_y_given_x)
+        h_x_given_y = InformationTheory.entropy_batch(joint_probs.sum(axis=-2), base, out=h_x_given_y)
+        np.subtract(h_xy, h_y_given_x, out=h_y_given_x)
+        np.subtract(h_xy, h_x_given_y, out=h_x_given_y)
+        return h_y_given_x, h_x_given_y
+
+    @staticmethod
+    def mutual_information_batch(joint_probs: np.ndarray, base: int = 2,
+                                 out: np.ndarray = None) -> np.ndarray:
+        """
+        Mutual information I(X;Y) = H(X) + H(Y) - H(X,Y) of a stack of joint distributions.
+    
+        Args:
+            joint_probs: Array shaped (..., n, m)
+            base: Logarithm base
+            out: Optional output array shaped (...)
+        
+        Returns:
+            Mutual information shaped (...)
+        """
+        joint_probs = np.asarray(joint_probs, dtype=float)
+        out = InformationTheory.entropy_batch(joint_probs.sum(axis=-1), base, out=out)
+        out += InformationTheory.entropy_batch(joint_probs.sum(axis=-2), base)
+        out -= InformationTheory.joint_entropy_batch(joint_probs, base)
+        return out
+
+    @staticmethod
+    def sliding_window_entropy(counts: np.ndarray, window: int, base: int = 2,
+                               out: np.ndarray = None) -> np.ndarray:
+        """
+        Entropy of the pooled histogram of every `window` consecutive rows.
+    
+        Window sums come from a running cumulative sum, so the cost does
+        not grow with the window length.
+    
+        Args:
+            counts: Histograms shaped (T, n), e.g. symbol counts per time step
+            window: Number of consecutive rows per window
+            base: Logarithm base
+            out: Optional output array shaped (T - window + 1,)
+        
+        Raises:
+            ValueError: If window < 1
+        
+        Returns:
+            Entropies shaped (T - window + 1,), empty if window > T
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        counts = np.asarray(counts, dtype=float)
+        cum = np.cumsum(counts, axis=0)
+        pooled = cum[window - 1:].copy()
+        pooled[1:] -= cum[:-window]
+        totals = pooled.sum(axis=1, keepdims=True)
+        pooled /= np.where(totals > 0, totals, 1.0)
+        return InformationTheory.entropy_batch(pooled, base, out=out)
+
+
+class DiscreteChannel:
+    """Models for discrete communication channels."""
+
+    def __init__(self, transition_matrix: np.ndarray):
+        """
+        Initialize a discrete channel with transition probabilities.
+    
+        Args:
+            transition_matrix: Matrix where element [i,j] = P(output=j | input=i)
+                             Rows must sum to 1.
+        """
+        self.transition_matrix = np.array(transition_matrix)
+        if not np.allclose(self.transition_matrix.sum(axis=1), 1.0):
+            raise ValueError("Each row of transition matrix must sum to 1")
+    
+        self.n_inputs = transition_matrix.shape[0]
+        self.n_outputs = transition_matrix.shape[1]
+
+    @classmethod
+    def binary_symmetric_channel(cls, error_prob: float):
+        """
+        Create a Binary Symmetric Channel (BSC).
+    
+        This is Shannon's canonical example:
+        - Input: {0, 1}
+        - Output: {0, 1}
+        - Each bit flips with probability p
+    
+        Args:
+            error_prob: Probability of bit flip (p)
+        
+        Returns:
+            DiscreteChannel instance
+        """
+        p = error_prob
+        transition = np.array([
+            [1-p, p],    # If send 0: receive 0 with prob 1-p, receive 1 with prob p
+            [p, 1-p]     # If send 1: receive 1 with prob 1-p, receive 0 with prob p
+        ])
+        return cls(transition)
+
+    @instrumented(size=lambda self, *args, **kwargs: self.transition_matrix.size)
+    def capacity(self, tol: float = 1e-6, max_iter: int = 10000) -> float:
+        """
+        Calculate channel capacity C = max[I(X;Y)]
+    
+        This is maximized over all possible input distributions
+        using the Blahut-Arimoto algorithm.
+    
+        Args:
+            tol: Stop when upper and lower capacity bounds are within tol bits
+            max_iter: Maximum number of iterations
+        
+        Returns:
+            Channel capacity in bits per transmission
+        """
+        c, _ = DiscreteChannel.blahut_arimoto(self.transition_matrix, tol, max_iter)
+        return float(c)
+
+    def optimal_input_distribution(self, tol: float = 1e-6,
+                                   max_iter: int = 10000) -> np.ndarray:
+        """
+        Input distribution p(x) that achieves capacity.
+    
+        Returns:
+            Array of n_inputs probabilities
+        """
+        _, p = DiscreteChannel.blahut_arimoto(self.transition_matrix, tol, max_iter)
+        return p
+
+    @staticmethod
+    def blahut_arimoto(transition_matrices: np.ndarray, tol: float = 1e-6,
+                       max_iter: int = 10000,
+                       max_step: float = 100.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Blahut-Arimoto capacity of one channel or a stack of channels.
+    
+        Each iteration gives bounds
+            log Σ_x p(x) e^D(x) <= C <= max_x D(x),
+        with D(x) = Σ_y W(y|x) log[W(y|x) / q(y)], and a channel stops
+        once the bounds are within tol. Converged channels are recorded at
+        once and dropped from the working set in batches (whenever a quarter
+        of it has converged), so a few of them may still be iterated on briefly.
+        Channels still apart after max_iter iterations get their last lower
+        bound, and a RuntimeWarning reports how many there were and the
+        largest remaining gap.
+    
+        The update p(x) <- p(x) e^(μ D(x)) uses the accelerated step of
+        Matz & Duhamel, μ = D(p_k||p_k-1) / D(q_k||q_k-1), falling back
+        to plain Blahut-Arimoto (μ = 1) whenever the bound gap grows.
+        The bounds hold for any p, so the stopping test is unaffected.
+    
+        Args:
+            transition_matrices: Array shaped (..., n_inputs, n_outputs),
+                                 rows summing to 1
+            tol: Gap between capacity bounds at which to stop (bits)
+            max_iter: Maximum number of iterations
+            max_step: Upper limit for the step μ (1 disables acceleration)
+        
+        Raises:
+            ValueError: If max_iter < 1
+        
+        Returns:
+            Tuple of (capacity in bits shaped (...),
+                      optimal input distribution shaped (..., n_inputs))
+        
+        Example:
+            >>> bsc = np.array([[0.9, 0.1], [0.1, 0.9]])
+            >>> c, p = DiscreteChannel.blahut_arimoto(bsc)
+            >>> c, p
+            (0.531, [0.5, 0.5])
+        """
+        if max_iter < 1:
+            raise ValueError("max_iter must be at least 1")
+        w = np.asarray(transition_matrices, dtype=float)
+        batch_shape = w.shape[:-2]
+        n_in, n_out = w.shape[-2:]
+        w = w.reshape(-1, n_in, n_out)
+    
+        def xlogy_ratio(a, b):
+            # Σ a log(a / b) along the last axis, with 0 log 0 = 0
+            ratio = np.divide(a, b, out=np.ones_like(a), where=a > 0)
+            return np.sum(a * np.log(ratio), axis=-1)
+    
+        # Σ_y W log W per input row, with 0 log 0 = 0
+        log_w = np.log(w, out=np.zeros_like(w), where=w > 0)
+        w_log_w = np.sum(w * log_w, axis=2)
+    
+        p = np.full((len(w), n_in), 1.0 / n_in)
+        capacity = np.zeros(len(w))
+        tol_nats = tol * np.log(2)
+    
+        # Working copies of the unconverged channels; they are only compacted
+        # once a quarter of them have converged, so a sweep does not copy the
+        # whole stack on every iteration.
+        active = np.arange(len(w))
+        wa, wla, pa = w, w_log_w, p.copy()
+        running = np.ones(len(w), dtype=bool)
+        p_prev = q_prev = None
+        gap_prev = np.full(len(w), np.inf)
+    
+        for _ in range(max_iter):
+            q = np.matmul(pa[:, None, :], wa)[:, 0, :]
+            # columns with q = 0 only meet W = 0 entries, so their log is irrelevant
+            log_q = np.log(q, out=np.zeros_like(q), where=q > 0)
+            d = wla - np.matmul(wa, log_q[:, :, None])[:, :, 0]
+        
+            d_max = d.max(axis=1)
+            e = np.exp(d - d_max[:, None])
+            lower = d_max + np.log(np.sum(pa * e, axis=1))
+            upper = d_max
+            gap = upper - lower
+        
+            done = running & (gap < tol_nats)
+            if done.any():
+                capacity[active[done]] = lower[done]
+                p[active[done]] = pa[done]
+                running &= ~done
+            if not running.any():
+                break
+        
+            mu = np.ones(len(pa))
+            if max_step > 1 and p_prev is not None:
+                d_q = xlogy_ratio(q, q_prev)
+                step = xlogy_ratio(pa, p_prev) / np.where(d_q > 0, d_q, np.inf)
+                mu = np.where(gap < gap_prev, np.clip(step, 1.0, max_step), 1.0)
+            p_prev, q_prev, gap_prev = pa, q, gap
+        
+            pa = pa * np.exp(mu[:, None] * (d - d_max[:, None]))
+            pa /= pa.sum(axis=1, keepdims=True)
+        
+            if running.sum() * 4 <= 3 * len(running):
+                keep = running
+                active, wa, wla, pa = active[keep], wa[keep], wla[keep], pa[keep]
+                p_prev, q_prev, gap_prev = p_prev[keep], q_prev[keep], gap_prev[keep]
+                lower = lower[keep]
+                running = np.ones(len(active), dtype=bool)
+        else:
+            # max_iter reached: report the last lower bound for the rest
+            # (p_prev, gap_prev and lower all match the working set here)
+            capacity[active[running]] = lower[running]
+            p[active[running]] = p_prev[running]
+            warnings.warn(
+                f"Blahut-Arimoto did not converge for {running.sum()} of {len(w)} "
+                f"channel(s) in {max_iter} iterations; largest bound gap "
+                f"{gap_prev[running].max() / np.log(2):.3g} bits", RuntimeWarning, stacklevel=2)
+    
+        capacity = np.maximum(capacity, 0.0) / np.log(2)
+        return capacity.reshape(batch_shape), p.reshape(batch_shape + (n_in,))
+
+    def bsc_capacity(self, error_prob: float) -> float:
+        """
+        Calculate capacity of Binary Symmetric Channel analytically.
+    
+        C = 1 - H(p) where H(p) is binary entropy function
+    
+        Args:
+            error_prob: Error probability p
+        
+        Returns:
+            Capacity in bits per transmission
+        """
+        if error_prob == 0 or error_prob == 1:
+            return 1.0
+        h_p = InformationTheory.entropy([error_prob, 1 - error_prob])
+        return 1 - h_p
+
+
+class ChannelSimulator:
+    """Monte Carlo simulation of discrete channels."""
+
+    # Bits per BSC work unit (8 MB of packed noise)
+    CHUNK_BITS = 1 << 26
+
+    # Symbols per work unit for general channels
+    CHUNK_SYMBOLS = 1 << 22
+
+    # Below this error probability BSC noise is drawn as geometric gaps
+    GEOMETRIC_MAX_P = 1 / 32
+
+    # Bits of the error probability used by the bitwise noise generator
+    NOISE_PRECISION = 32
+
+    @staticmethod
+    def _popcount(words: np.ndarray) -> int:
+        """Number of set bits in an unsigned integer array."""
+        if hasattr(np, 'bitwise_count'):
+            return int(np.bitwise_count(words).sum(dtype=np.int64))
+        table = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+        return int(table[words.view(np.uint8)].sum())
+
+    @staticmethod
+    def _valid_mask(n_bits: int) -> np.ndarray:
+        """uint64 words with exactly the first n_bits bits set."""
+        n_bytes = -(-n_bits // 64) * 8
+        valid = np.zeros(n_bytes, dtype=np.uint8)
+        valid[:n_bits // 8] = 0xFF
+        if n_bits % 8:
+            valid[n_bits // 8] = (1 << (n_bits % 8)) - 1
+        return valid.view(np.uint64)
+
+    @staticmethod
+    def bsc_noise(error_prob: float, n_bits: int,
+                  rng: np.random.Generator) -> np.ndarray:
+        """
+        Packed BSC error pattern: each of n_bits bits is 1 with probability p.
+    
+        Small p: flip positions are drawn as geometric gaps, so the cost is
+        proportional to the number of errors; p close to 1 does the same
+        for the bits that are not flipped. Otherwise each output word is
+        built from NOISE_PRECISION random words: going from the lowest bit of
+        p to the highest, m = m | r for a 1 bit and m = m & r for a 0 bit
+        gives P(bit set) = p (rounded to NOISE_PRECISION bits).
+    
+        Returns:
+            uint64 array of ceil(n_bits / 64) words, unused tail bits zero
+        """
+        valid = ChannelSimulator._valid_mask(n_bits)
+        if error_prob <= 0:
+            return np.zeros_like(valid)
+        if error_prob >= 1:
+            return valid
+    
+        if error_prob <= ChannelSimulator.GEOMETRIC_MAX_P:
+            return ChannelSimulator._sparse_noise(error_prob, n_bits, len(valid), rng)
+        if error_prob >= 1 - ChannelSimulator.GEOMETRIC_MAX_P:
+            return valid & ~ChannelSimulator._sparse_noise(1 - error_prob, n_bits, len(valid), rng)
+    
+        bits = ChannelSimulator.NOISE_PRECISION
+        p_fixed = min(max(int(round(error_prob * (1 << bits))), 1), (1 << bits) - 1)
+        mask = np.zeros(len(valid), dtype=np.uint64)
+        for i in range(bits):
+            r = rng.bit_generator.random_raw(len(valid))
+            if (p_fixed >> i) & 1:
+                mask |= r
+            else:
+                mask &= r
+        return mask & valid
+
+    @staticmethod
+    def _sparse_noise(error_prob: float, n_bits: int, n_words: int,
+                      rng: np.random.Generator) -> np.ndarray:
+        """Packed noise with flip positions drawn as geometric gaps."""
+        positions = []
+        last = -1
+        while last < n_bits:
+            size = min(int(n_bits * error_prob * 1.1) + 64, 1 << 22)
+            pos = last + np.cumsum(rng.geometric(error_prob, size=size))
+            positions.append(pos[pos < n_bits])
+            last = pos[-1]
+        pos = np.concatenate(positions)
+        noise = np.bincount(pos >> 3, weights=1 << (pos & 7),
+                            minlength=8 * n_words).astype(np.uint8)
+        return noise.view(np.uint64)
+
+    @staticmethod
+    def _bsc_chunk(error_prob: float, n_bits: int, seed) -> np.ndarray:
+        """Joint counts [[n00, n01], [n10, n11]] of (sent, received) bits for one chunk."""
+        rng = np.random.default_rng(seed)
+        x = rng.bit_generator.random_raw(-(-n_bits // 64)) & ChannelSimulator._valid_mask(n_bits)
+        y = x ^ ChannelSimulator.bsc_noise(error_prob, n_bits, rng)
+    
+        popcount = ChannelSimulator._popcount
+        ones_x, ones_y, n11 = popcount(x), popcount(y), popcount(x & y)
+        n10 = ones_x - n11
+        n01 = ones_y - n11
+        return np.array([[n_bits - n10 - n01 - n11, n01], [n10, n11]], dtype=np.int64)
+
+    @staticmethod
+    def _channel_chunk(transition_matrix: np.ndarray, input_probs: np.ndarray,
+                       n_symbols: int, seed) -> np.ndarray:
+        """Joint counts of (input, output) symbols for one chunk."""
+        rng = np.random.default_rng(seed)
+        n_in, n_out = transition_matrix.shape
+        x = rng.choice(n_in, size=n_symbols, p=input_probs)
+    
+        # Row i of the CDF shifted by i makes one sorted array, so a single
+        # searchsorted samples y for every x
+        cdf = np.cumsum(transition_matrix, axis=1)
+        cdf[:, -1] = 1.0
+        shifted = (cdf + np.arange(n_in)[:, None]).ravel()
+        y = np.searchsorted(shifted, x + rng.random(n_symbols), side='right') - x * n_out
+        y = np.minimum(y, n_out - 1)
+    
+        return np.bincount(x * n_out + y, minlength=n_in * n_out).reshape(n_in, n_out)
+
+    @staticmethod
+    def _run_chunks(worker, args: tuple, total: int, chunk: int,
+                    seed, processes: int) -> np.ndarray:
+        """
+        Split total into chunks, each with its own child seed, and sum the
+        joint counts. Results depend only on seed and chunk size, not on
+        the number of processes.
+        """
+        if total < 1:
+            raise ValueError("number of channel uses must be at least 1")
+        sizes = [chunk] * (total // chunk) + ([total % chunk] if total % chunk else [])
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [args + (size, s) for size, s in zip(sizes, seeds)]
+    
+        if processes > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(processes) as pool:
+                return sum(pool.map(worker, *zip(*jobs)))
+        return sum(worker(*job) for job in jobs)
+
+    @staticmethod
+    def _summary(joint_counts: np.ndarray) -> Dict[str, float]:
+        n = int(joint_counts.sum())
+        errors = n - int(np.trace(joint_counts)) if joint_counts.shape[0] == joint_counts.shape[1] else None
+        return {
+            'n': n,
+            'errors': errors,
+            'error_rate': errors / n if errors is not None and n else None,
+            'mutual_information': float(InformationTheory.mutual_information(joint_counts / n)),
+            'joint_counts': joint_counts,
+        }
+
+    @staticmethod
+    def simulate_bsc(error_prob: float, n_bits: int, seed: int = None,
+                     processes: int = 1, chunk_bits: int = CHUNK_BITS) -> Dict[str, float]:
+        """
+        Send n_bits uniform random bits through a BSC.
+    
+        Bits are handled 64 at a time as uint64 words: the channel output is
+        input XOR a packed noise mask, and all counts come from popcounts.
+    
+        Args:
+            error_prob: Bit flip probability p
+            n_bits: Number of bits to send
+            seed: Seed for reproducible runs
+            processes: Worker processes (1 = in-process)
+            chunk_bits: Bits per work unit
+        
+        Returns:
+            Dictionary with n, errors, error_rate, mutual_information
+            (bits per use), joint_counts and the theoretical capacity
+        
+        Raises:
+            ValueError: If n_bits < 1
+        
+        Example:
+            >>> ChannelSimulator.simulate_bsc(0.1, 10**8, seed=1)['error_rate']
+            0.1
+        """
+        joint = ChannelSimulator._run_chunks(ChannelSimulator._bsc_chunk, (error_prob,),
+                                             n_bits, chunk_bits, seed, processes)
+        result = ChannelSimulator._summary(joint)
+        channel = DiscreteChannel.binary_symmetric_channel(error_prob)
+        result['capacity'] = channel.bsc_capacity(error_prob)
+        return result
+
+    @staticmethod
+    def simulate(channel: DiscreteChannel, n_symbols: int,
+                 input_probs: np.ndarray = None, seed: int = None,
+                 processes: int = 1,
+                 chunk_symbols: int = CHUNK_SYMBOLS) -> Dict[str, float]:
+        """
+        Send n_symbols random inputs through a general discrete channel.
+    
+        Inputs are drawn from input_probs and outputs by inverse-CDF
+        sampling from the transition matrix, one chunk of symbols at a time.
+    
+        Args:
+            channel: DiscreteChannel to simulate
+            n_symbols: Number of channel uses
+            input_probs: Input distribution (default: uniform)
+            seed: Seed for reproducible runs
+            processes: Worker processes (1 = in-process)
+            chunk_symbols: Symbols per work unit
+        
+        Returns:
+            Dictionary with n, errors and error_rate (output != input, square
+            channels only), mutual_information (bits per use) and joint_counts
+        
+        Raises:
+            ValueError: If n_symbols < 1
+        """
+        if input_probs is None:
+            input_probs = np.full(channel.n_inputs, 1.0 / channel.n_inputs)
+        joint = ChannelSimulator._run_chunks(
+            ChannelSimulator._channel_chunk,
+            (channel.transition_matrix, np.asarray(input_probs, dtype=float)),
+            n_symbols, chunk_symbols, seed, processes)
+        return ChannelSimulator._summary(joint)
+
+
+class ContinuousChannel:
+    """Models for continuous (analog) channels."""
+
+    @staticmethod
+    def shannon_hartley_capacity(bandwidth: float, snr: float) -> float:
+        """
+        Calculate capacity of Gaussian channel (Shannon-Hartley theorem).
+    
+        C = B * log₂(1 + SNR)
+    
+        Args:
+            bandwidth: Bandwidth in Hz
+            snr: Signal-to-noise ratio (S/N, not in dB)
+        
+        Returns:
+            Capacity in bits per second
+        
+        Example:
+            >>> # Telephone line: 3000 Hz, SNR = 1000
+            >>> ContinuousChannel.shannon_hartley_capacity(3000, 1000)
+            29903.5  # ~30 kbps
+        """
+        return bandwidth * np.log2(1 + snr)
+
+    @staticmethod
+    def snr_from_db(snr_db: float) -> float:
+        """Convert SNR from decibels to linear scale."""
+        return 10 ** (snr_db / 10)
+
+    @staticmethod
+    def snr_to_db(snr_linear: float) -> float:
+        """Convert SNR from linear scale to decibels."""
+        return 10 * np.log10(snr_linear)
+
+    @staticmethod
+    def gaussian_entropy(variance: float) -> float:
+        """
+        Calculate differential entropy of Gaussian distribution.
+    
+        h(X) = (1/2) * log₂(2πeσ²)
+    
+        Args:
+            variance: Variance σ² of the Gaussian
+        
+        Returns:
+            Differential entropy in bits
+        """
+        return 0.5 * np.log2(2 * np.pi * np.e * variance)
+
+
+class SourceCoding:
+    """Source coding (compression) algorithms."""
+
+    @staticmethod
+    def huffman_code(probabilities: Dict[str, float]) -> Dict[str, str]:
+        """
+        Generate optimal Huffman code for given symbol probabilities.
+    
+        This is the optimal prefix-free code that achieves average length
+        closest to entropy.
+    
+        Args:
+            probabilities: Dictionary mapping symbols to probabilities
+        
+        Returns:
+            Dictionary mapping symbols to binary codewords (canonical form)
+        
+        Example:
+            >>> probs = {'A': 0.5, 'B': 0.25, 'C': 0.125, 'D': 0.125}
+            >>> code = SourceCoding.huffman_code(probs)
+            >>> code
+            {'A': '0', 'B': '10', 'C': '110', 'D': '111'}
+        """
+        lengths = SourceCoding.huffman_code_lengths(probabilities)
+        return SourceCoding.canonical_code(lengths)
+
+    @staticmethod
+    def huffman_code_lengths(probabilities: Dict[str, float]) -> Dict[str, int]:
+        """
+        Huffman codeword length for each symbol.
+    
+        The tree is stored as a parent array and depths are filled in
+        from the root down, so no recursion is needed however skewed
+        the probabilities are.
+    
+        Args:
+            probabilities: Dictionary mapping symbols to probabilities (or counts)
+        
+        Returns:
+            Dictionary mapping symbols to codeword lengths in bits
+        
+        Example:
+            >>> SourceCoding.huffman_code_lengths({'A': 0.5, 'B': 0.25, 'C': 0.25})
+            {'A': 1, 'B': 2, 'C': 2}
+        """
+        import heapq
+    
+        symbols = list(probabilities)
+        n = len(symbols)
+        if n == 1:
+            return {symbols[0]: 1}
+    
+        # Min-heap of (probability, node id); leaves are ids 0..n-1
+        heap = [(probabilities[sym], i) for i, sym in enumerate(symbols)]
+        heapq.heapify(heap)
+        parent = [0] * (2 * n - 1)
+    
+        next_id = n
+        while len(heap) > 1:
+            lo = heapq.heappop(heap)
+            hi = heapq.heappop(heap)
+            parent[lo[1]] = parent[hi[1]] = next_id
+            heapq.heappush(heap, (lo[0] + hi[0], next_id))
+            next_id += 1
+    
+        # Parents always have larger ids than their children
+        depth = [0] * (2 * n - 1)
+        for node in range(2 * n - 3, -1, -1):
+            depth[node] = depth[parent[node]] + 1
+    
+        return {sym: depth[i] for i, sym in enumerate(symbols)}
+
+    @staticmethod
+    def canonical_code(lengths: Dict[str, int]) -> Dict[str, str]:
+        """
+        Canonical prefix code for given codeword lengths.
+    
+        Codewords are assigned in order of (length, symbol order), each one
+        the previous codeword plus one, shifted left when the length grows.
+        Only the lengths need to be stored to rebuild the code.
+    
+        Args:
+            lengths: Dictionary mapping symbols to codeword lengths
+        
+        Returns:
+            Dictionary mapping symbols to binary codewords
+        """
+        symbols = list(lengths)
+        order = sorted(range(len(symbols)), key=lambda i: lengths[symbols[i]])
+        codes = {}
+        code = 0
+        prev_len = 0
+        for i in order:
+            sym = symbols[i]
+            code <<= lengths[sym] - prev_len
+            prev_len = lengths[sym]
+            codes[sym] = format(code, f'0{prev_len}b')
+            code += 1
+        return codes
+
+    @staticmethod
+    def average_code_length(probabilities: Dict[str, float], 
+                           code: Dict[str, str]) -> float:
+        """
+        Calculate average codeword length L = ∑ p_i * l_i
+    
+        Args:
+            probabilities: Symbol probabilities
+            code: Dictionary mapping symbols to codewords
+        
+        Returns:
+            Average bits per symbol
+        """
+        return sum(probabilities[sym] * len(code[sym]) 
+                  for sym in probabilities)
+
+    @staticmethod
+    def coding_efficiency(probabilities: Dict[str, float],
+                         code: Dict[str, str]) -> float:
+        """
+        Calculate efficiency = H / L
+    
+        Where H is entropy and L is average code length.
+        Perfect efficiency = 1.0 (achieving entropy bound)
+    
+        Args:
+            probabilities: Symbol probabilities
+            code: Dictionary mapping symbols to codewords
+        
+        Returns:
+            Efficiency (0 to 1)
+        """
+        probs_list = list(probabilities.values())
+        h = InformationTheory.entropy(probs_list)
+        l = SourceCoding.average_code_length(probabilities, code)
+        return h / l if l > 0 else 0
+
+
+class HuffmanCodec:
+    """Canonical Huffman compressor for byte data with table-driven decoding."""
+
+    # Longest allowed codeword; decoding is a single lookup of this many bits
+    TABLE_BITS = 12
+
+    # Symbols per independently decodable block
+    BLOCK_SYMBOLS = 4096
+
+    def __init__(self, lengths: np.ndarray):
+        """
+        Build encode/decode tables from codeword lengths.
+    
+        Args:
+            lengths: 256 codeword lengths indexed by byte value
+                     (0 = byte does not occur), at most TABLE_BITS each
+        """
+        self.lengths = np.asarray(lengths, dtype=np.uint8)
+        if self.lengths.max(initial=0) > self.TABLE_BITS:
+            raise ValueError(f"Codeword lengths must not exceed {self.TABLE_BITS} bits")
+    
+        present = {sym: int(l) for sym, l in enumerate(self.lengths) if l > 0}
+        self.codes = np.zeros(256, dtype=np.uint32)
+        for sym, word in SourceCoding.canonical_code(present).items():
+            self.codes[sym] = int(word, 2)
+    
+        # Every TABLE_BITS-bit window starting with a codeword maps to it
+        self.table_symbol = np.zeros(1 << self.TABLE_BITS, dtype=np.uint8)
+        self.table_length = np.zeros(1 << self.TABLE_BITS, dtype=np.uint8)
+        for sym, l in present.items():
+            lo = int(self.codes[sym]) << (self.TABLE_BITS - l)
+            hi = (int(self.codes[sym]) + 1) << (self.TABLE_BITS - l)
+            self.table_symbol[lo:hi] = sym
+            self.table_length[lo:hi] = l
+
+    @classmethod
+    def from_data(cls, data: bytes) -> 'HuffmanCodec':
+        """
+        Build a codec from the byte frequencies of data.
+    
+        If the Huffman code is longer than TABLE_BITS, the counts are
+        halved (keeping every symbol at least 1) and the code rebuilt,
+        which costs very little compression.
+        """
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        while True:
+            weights = {sym: int(c) for sym, c in enumerate(counts) if c > 0}
+            lengths = np.zeros(256, dtype=np.uint8)
+            if weights:
+                for sym, l in SourceCoding.huffman_code_lengths(weights).items():
+                    lengths[sym] = min(l, 255)
+            if lengths.max(initial=0) <= cls.TABLE_BITS:
+                return cls(lengths)
+            counts = np.where(counts > 0, np.maximum(counts >> 1, 1), 0)
+
+    def encode(self, data: bytes) -> Tuple[bytes, np.ndarray]:
+        """
+        Encode bytes into a packed MSB-first bitstream.
+    
+        Returns:
+            Tuple of (payload bytes, bit offset of every BLOCK_SYMBOLS-th symbol)
+        """
+        symbols = np.frombuffer(data, dtype=np.uint8)
+        lengths = self.lengths[symbols].astype(np.int64)
+        if len(symbols) and lengths.min() == 0:
+            raise ValueError("Data contains bytes the code does not cover")
+    
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        block_offsets = starts[::self.BLOCK_SYMBOLS]
+        total_bits = int(ends[-1]) if len(ends) else 0
+    
+        # A codeword at bit offset s fits in the 24 bits starting at byte
+        # s // 8; codewords never share bits, so adding their byte pieces
+        # packs the stream. Chunked to bound the temporaries.
+        out = np.zeros((total_bits + 7) // 8 + 2, dtype=np.uint8)
+        chunk = 1 << 20
+        for lo in range(0, len(symbols), chunk):
+            sym = symbols[lo:lo + chunk]
+            start = starts[lo:lo + chunk]
+            byte = start >> 3
+            shift = 24 - lengths[lo:lo + chunk] - (start & 7)
+            word = self.codes[sym].astype(np.int64) << shift
+            base = int(byte[0])
+            idx = byte - base
+            size = int(idx[-1]) + 3
+            for k, piece in enumerate((word >> 16, (word >> 8) & 0xFF, word & 0xFF)):
+                out[base + k:base + k + size - 2] += np.bincount(
+                    idx, weights=piece, minlength=size - 2).astype(np.uint8)
+        return out[:(total_bits + 7) // 8].tobytes(), block_offsets
+
+    def decode(self, payload: bytes, n_symbols: int,
+               block_offsets: np.ndarray) -> bytes:
+        """
+        Decode a bitstream produced by encode.
+    
+        Each step looks up TABLE_BITS bits at once, for all blocks in
+        parallel, so the Python loop runs BLOCK_SYMBOLS times rather than
+        once per bit or per symbol.
+        """
+        if n_symbols == 0:
+            return b''
+        buf = np.frombuffer(payload, dtype=np.uint8).astype(np.uint32)
+        buf = np.concatenate((buf, np.zeros(3, dtype=np.uint32)))
+        # 24-bit window starting at every byte
+        windows = (buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:]
+        last_bit = 8 * len(payload)
+    
+        n_blocks = len(block_offsets)
+        pos = np.asarray(block_offsets, dtype=np.int64).copy()
+        out = np.empty((n_blocks, self.BLOCK_SYMBOLS), dtype=np.uint8)
+        mask = (1 << self.TABLE_BITS) - 1
+        for t in range(self.BLOCK_SYMBOLS):
+            # the tail of the last block runs into padding; keep it in bounds
+            np.minimum(pos, last_bit, out=pos)
+            shift = (24 - self.TABLE_BITS - (pos & 7)).astype(np.uint32)
+            key = (windows[pos >> 3] >> shift) & mask
+            out[:, t] = self.table_symbol[key]
+            pos += self.table_length[key]
+        return out.reshape(-1)[:n_symbols].tobytes()
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Encode data into a self-contained byte string:
+        symbol count (8 bytes), 256 codeword lengths, block count (8 bytes),
+        block bit offsets (8 bytes each), then the bitstream.
+        """
+        payload, offsets = self.encode(data)
+        header = np.array([len(data)], dtype='<u8').tobytes() + self.lengths.tobytes()
+        header += np.array([len(offsets)], dtype='<u8').tobytes()
+        return header + offsets.astype('<u8').tobytes() + payload
+
+    @classmethod
+    def decompress(cls, blob: bytes) -> bytes:
+        """Inverse of compress."""
+        n_symbols = int(np.frombuffer(blob, dtype='<u8', count=1)[0])
+        codec = cls(np.frombuffer(blob, dtype=np.uint8, count=256, offset=8))
+        n_blocks = int(np.frombuffer(blob, dtype='<u8', count=1, offset=264)[0])
+        offsets = np.frombuffer(blob, dtype='<u8', count=n_blocks, offset=272).astype(np.int64)
+        return codec.decode(blob[272 + 8 * n_blocks:], n_symbols, offsets)
+
+    def bits_per_symbol(self, data: bytes) -> float:
+        """Average codeword length over data, for comparison with its entropy."""
+        symbols = np.frombuffer(data, dtype=np.uint8)
+        return float(self.lengths[symbols].mean()) if len(symbols) else 0.0
+
+
+class TextAnalysis:
+    """Analyze entropy and redundancy of text."""
+
+    # Symbols used by the streaming n-gram counter (26 letters + space)
+    ENGLISH_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ "
+
+    # Largest n-gram table counted with np.bincount; bigger ones use np.unique
+    DENSE_TABLE_LIMIT = 1 << 24
+
+    @staticmethod
+    def letter_frequencies(text: str, normalize: bool = True) -> Dict[str, float]:
+        """
+        Calculate letter frequencies in text.
+    
+        Args:
+            text: Input text
+            normalize: If True, return probabilities; if False, return counts
+        
+        Returns:
+            Dictionary of letter frequencies/probabilities
+        """
+        text = text.upper()
+        text = ''.join(c for c in text if c.isalpha() or c.isspace())
+    
+        counter = Counter(text)
+    
+        if normalize:
+            total = sum(counter.values())
+            return {k: v/total for k, v in counter.items()}
+        return dict(counter)
+
+    @staticmethod
+    def ngram_frequencies(text: str, n: int = 2, 
+                         normalize: bool = True) -> Dict[str, float]:
+        """
+        Calculate n-gram frequencies.
+    
+        Args:
+            text: Input text
+            n: Length of n-grams (2=bigrams, 3=trigrams, etc.)
+            normalize: If True, return probabilities
+        
+        Returns:
+            Dictionary of n-gram frequencies
+        """
+        text = text.upper()
+        text = ''.join(c for c in text if c.isalpha() or c.isspace())
+    
+        ngrams = [''.join(text[i:i+n]) for i in range(len(text)-n+1)]
+        counter = Counter(ngrams)
+    
+        if normalize:
+            total = sum(counter.values())
+            return {k: v/total for k, v in counter.items()}
+        return dict(counter)
+
+    @staticmethod
+    @instrumented
+    def text_entropy(text: str, n: int = 1) -> float:
+        """
+        Calculate n-gram entropy of text.
+    
+        Args:
+            text: Input text
+            n: Order (1=unigram, 2=bigram, etc.)
+        
+        Returns:
+            Entropy in bits per n-gram
+        """
+        freqs = TextAnalysis.ngram_frequencies(text, n, normalize=True)
+        probs = list(freqs.values())
+        h = InformationTheory.entropy(probs)
+        return h / n  # Per symbol
+
+    @staticmethod
+    def _symbol_table(alphabet: str) -> np.ndarray:
+        """
+        Byte -> symbol code + 1 lookup (0 = dropped).
+    
+        Matching is case-insensitive, and if the alphabet has a space
+        every ASCII whitespace byte maps to it. Non-ASCII bytes are dropped,
+        so UTF-8 input can be split anywhere.
+        """
+        if any(ord(ch) > 127 for ch in alphabet):
+            raise ValueError("Alphabet must be ASCII")
+        table = np.zeros(256, dtype=np.uint8)
+        for i, ch in enumerate(alphabet):
+            table[ord(ch.upper())] = table[ord(ch.lower())] = i + 1
+        if ' ' in alphabet:
+            for ch in ' \t\n\r\x0b\x0c':
+                table[ord(ch)] = alphabet.index(' ') + 1
+        return table
+
+    @staticmethod
+    def _window_codes(seq: np.ndarray, n: int, k: int) -> np.ndarray:
+        """Rolling base-k integer code of every length-n window of seq."""
+        m = len(seq) - n + 1
+        if m <= 0:
+            # seq[j:j + m] would wrap around instead of being empty
+            return np.zeros(0, dtype=np.int64)
+        codes = np.zeros(m, dtype=np.int64)
+        for j in range(n):
+            codes *= k
+            codes += seq[j:j + m]
+        return codes
+
+    @staticmethod
+    def _tally(acc, codes: np.ndarray, counts: np.ndarray = None, size: int = 0):
+        """
+        Add n-gram codes (with optional multiplicities) to an accumulator:
+        a dense count array for tables up to DENSE_TABLE_LIMIT, otherwise
+        a sorted (codes, counts) pair.
+        """
+        if size <= TextAnalysis.DENSE_TABLE_LIMIT:
+            if acc is None:
+                acc = np.zeros(size, dtype=np.int64)
+            if counts is None and len(codes) * 16 >= size:
+                acc += np.bincount(codes, minlength=size)
+            elif counts is None:
+                # a bincount would allocate up to the largest code, so small
+                # chunks are sorted instead and cost O(chunk log chunk)
+                codes, chunk_counts = np.unique(codes, return_counts=True)
+                acc[codes] += chunk_counts
+            else:
+                acc[codes] += counts
+            return acc
+    
+        if counts is None:
+            codes, counts = np.unique(codes, return_counts=True)
+        if acc is not None:
+            codes = np.concatenate((acc[0], codes))
+            counts = np.concatenate((acc[1], counts))
+            codes, inverse = np.unique(codes, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        return codes, counts
+
+    @staticmethod
+    def _count_shard(path: str, start: int, end: int, n: int, alphabet: str,
+                     chunk_size: int):
+        """
+        Count n-grams in bytes [start, end) of a file, chunk by chunk.
+    
+        The last n-1 symbols of each chunk are carried into the next one,
+        so n-grams spanning chunk boundaries are counted exactly once.
+    
+        Returns:
+            Tuple of (codes, counts, head, tail) where head/tail are the
+            first/last n-1 symbols of the shard, for stitching shards together
+        """
+        table = TextAnalysis._symbol_table(alphabet)
+        k = len(alphabet)
+        size = k ** n
+        acc = None
+        head = np.zeros(0, dtype=np.uint8)
+        carry = head
+    
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                raw = f.read(min(chunk_size, remaining))
+                if not raw:
+                    break
+                remaining -= len(raw)
+            
+                symbols = table[np.frombuffer(raw, dtype=np.uint8)]
+                symbols = symbols[symbols > 0] - 1
+                if len(head) < n - 1:
+                    head = np.concatenate((head, symbols[:n - 1 - len(head)]))
+            
+                seq = np.concatenate((carry, symbols))
+                acc = TextAnalysis._tally(acc, TextAnalysis._window_codes(seq, n, k), size=size)
+                carry = seq[max(len(seq) - (n - 1), 0):]
+    
+        if acc is None:
+            acc = TextAnalysis._tally(None, np.zeros(0, dtype=np.int64), size=size)
+        if isinstance(acc, tuple):
+            codes, counts = acc
+        else:
+            codes = np.flatnonzero(acc)
+            counts = acc[codes]
+        return codes, counts, head, carry
+
+    @staticmethod
+    def ngram_code_counts(path: str, n: int = 2,
+                          alphabet: str = ENGLISH_ALPHABET,
+                          chunk_size: int = 1 << 24,
+                          processes: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count n-grams in a text file without loading it into memory.
+    
+        Bytes are mapped to symbol codes 0..k-1 of the alphabet (other
+        characters are dropped, as in ngram_frequencies), and each n-gram
+        is counted as the integer code Σ s_j k^(n-1-j). The file is split
+        into byte ranges counted in a process pool and merged; memory is
+        bounded by chunk_size and the n-gram table, not the file size.
+    
+        Args:
+            path: Text file to read
+            n: Length of n-grams
+            alphabet: ASCII symbols to count (case-insensitive)
+            chunk_size: Bytes read per step
+            processes: Worker processes (None = all cores, 1 = in-process)
+        
+        Returns:
+            Tuple of (n-gram codes, counts) for n-grams that occur
+        
+        Example:
+            >>> codes, counts = TextAnalysis.ngram_code_counts('corpus.txt', n=2)
+            >>> TextAnalysis.decode_ngram(codes[counts.argmax()], 2)
+            'E '
+        """
+        k = len(alphabet)
+        size = k ** n
+        if size >= 2 ** 63:
+            raise ValueError("n-gram table too large for 64-bit codes")
+    
+        file_size = os.path.getsize(path)
+        processes = processes or os.cpu_count() or 1
+        n_shards = min(4 * processes, max(file_size // chunk_size, 1))
+        bounds = np.linspace(0, file_size, n_shards + 1).astype(np.int64)
+        jobs = [(path, int(a), int(b), n, alphabet, chunk_size)
+                for a, b in zip(bounds[:-1], bounds[1:])]
+    
+        if processes > 1 and n_shards > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(processes) as pool:
+                shards = list(pool.map(TextAnalysis._count_shard, *zip(*jobs)))
+        else:
+            shards = [TextAnalysis._count_shard(*job) for job in jobs]
+    
+        # Merge shard tables, then add the n-grams spanning shard boundaries
+        acc = None
+        carry = np.zeros(0, dtype=np.uint8)
+        for codes, counts, head, tail in shards:
+            acc = TextAnalysis._tally(acc, codes, counts, size)
+            boundary = np.concatenate((carry, head))
+            acc = TextAnalysis._tally(acc, TextAnalysis._window_codes(boundary, n, k), size=size)
+            seq = np.concatenate((carry, tail))
+            carry = seq[max(len(seq) - (n - 1), 0):]
+    
+        if isinstance(acc, tuple):
+            return acc
+        codes = np.flatnonzero(acc)
+        return codes, acc[codes]
+
+    @staticmethod
+    def decode_ngram(code: int, n: int, alphabet: str = ENGLISH_ALPHABET) -> str:
+        """Turn an n-gram code from ngram_code_counts back into a string."""
+        k = len(alphabet)
+        chars = []
+        for _ in range(n):
+            code, sym = divmod(int(code), k)
+            chars.append(alphabet[sym])
+        return ''.join(reversed(chars))
+
+    @staticmethod
+    def ngram_frequencies_file(path: str, n: int = 2, normalize: bool = True,
+                               **kwargs) -> Dict[str, float]:
+        """
+        Calculate n-gram frequencies of a (large) text file.
+    
+        Same result format as ngram_frequencies; keyword arguments are
+        passed to ngram_code_counts.
+        """
+        alphabet = kwargs.get('alphabet', TextAnalysis.ENGLISH_ALPHABET)
+        codes, counts = TextAnalysis.ngram_code_counts(path, n, **kwargs)
+        total = counts.sum()
+        return {TextAnalysis.decode_ngram(c, n, alphabet): (v / total if normalize else int(v))
+                for c, v in zip(codes, counts)}
+
+    @staticmethod
+    def text_entropy_file(path: str, n: int = 1, **kwargs) -> float:
+        """
+        Calculate n-gram entropy of a (large) text file.
+    
+        Args:
+            path: Text file to read
+            n: Order (1=unigram, 2=bigram, etc.)
+            **kwargs: Passed to ngram_code_counts
+        
+        Returns:
+            Entropy in bits per symbol
+        """
+        _, counts = TextAnalysis.ngram_code_counts(path, n, **kwargs)
+        h = InformationTheory.entropy(counts / counts.sum())
+        return h / n  # Per symbol
+
+
+class Visualization:
+    """Plotting functions for information theory concepts."""
+
+    @staticmethod
+    def plot_binary_entropy():
+        """Plot binary entropy function H(p) vs p."""
+        import matplotlib.pyplot as plt
+
+        p = np.linspace(0.001, 0.999, 1000)
+        h = np.array([InformationTheory.entropy([pi, 1-pi]) for pi in p])
+    
+        plt.figure(figsize=(10, 6))
+        plt.plot(p, h, 'b-', linewidth=2)
+        plt.xlabel('Probability p', fontsize=12)
+        plt.ylabel('Entropy H(p) [bits]', fontsize=12)
+        plt.title('Binary Entropy Function', fontsize=14, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        plt.axhline(y=1, color='r', linestyle='--', alpha=0.5, label='Maximum (1 bit)')
+        plt.legend()
+        plt.tight_layout()
+        plt.show()
+
+    @staticmethod
+    def plot_bsc_capacity():
+        """Plot BSC capacity vs error probability."""
+        import matplotlib.pyplot as plt
+
+        p = np.linspace(0, 0.5, 1000)
+        c = np.array([1 - InformationTheory.entropy([pi, 1-pi]) if pi < 0.5 else 0 
+                     for pi in p])
+    
+        plt.figure(figsize=(10, 6))
+        plt.plot(p, c, 'b-', linewidth=2)
+        plt.xlabel('Error Probability p', fontsize=12)
+        plt.ylabel('Capacity C [bits/transmission]', fontsize=12)
+        plt.title('Binary Symmetric Channel Capacity', fontsize=14, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        plt.axhline(y=0, color='r', linestyle='--', alpha=0.5)
+        plt.axvline(x=0.5, color='r', linestyle='--', alpha=0.5, 
+                   label='p=0.5: Useless channel')
+        plt.legend()
+        plt.tight_layout()
+        plt.show()
+
+    @staticmethod
+    def plot_shannon_hartley(bandwidth: float = 4000):
+        """
+        Plot Shannon-Hartley capacity vs SNR.
+    
+        Args:
+            bandwidth: Channel bandwidth in Hz
+        """
+        import matplotlib.pyplot as plt
+
+        snr_db = np.linspace(-10, 40, 1000)
+        snr_linear = 10 ** (snr_db / 10)
+        capacity = bandwidth * np.log2(1 + snr_linear)
+    
+        plt.figure(figsize=(10, 6))
+        plt.plot(snr_db, capacity / 1000, 'b-', linewidth=2)
+        plt.xlabel('SNR [dB]', fontsize=12)
+        plt.ylabel('Capacity [kbps]', fontsize=12)
+        plt.title(f'Shannon-Hartley Capacity (Bandwidth = {bandwidth} Hz)', 
+                 fontsize=14, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        plt.show()
+
+
+# ============================================================================
+# EXAMPLE USAGE AND DEMONSTRATIONS
+# ============================================================================
+
+
+def demo_basic_entropy():
+    """Demonstrate basic entropy calculations."""
+    print("="*70)
+    print("BASIC ENTROPY CALCULATIONS")
+    print("="*70)
+
+    # Fair coin
+    print("\n1. Fair Coin:")
+    h = InformationTheory.entropy([0.5, 0.5])
+    print(f"   P(H) = 0.5, P(T) = 0.5")
+    print(f"   Entropy = {h:.3f} bits")
+
+    # Biased coin
+    print("\n2. Biased Coin:")
+    h = InformationTheory.entropy([0.9, 0.1])
+    print(f"   P(H) = 0.9, P(T) = 0.1")
+    print(f"   Entropy = {h:.3f} bits")
+
+    # Fair die
+    print("\n3. Fair Die:")
+    h = InformationTheory.entropy([1/6]*6)
+    print(f"   Six equally likely outcomes")
+    print(f"   Entropy = {h:.3f} bits")
+
+    # Maximum entropy
+    print("\n4. Maximum Entropy:")
+    h_max = InformationTheory.max_entropy(6)
+    print(f"   Maximum possible for 6 symbols = {h_max:.3f} bits")
+
+
+def demo_channel_capacity():
+    """Demonstrate channel capacity calculations."""
+    print("\n" + "="*70)
+    print("CHANNEL CAPACITY")
+    print("="*70)
+
+    # BSC with different error rates
+    print("\n1. Binary Symmetric Channel:")
+    for p in [0.0, 0.01, 0.1, 0.5]:
+        channel = DiscreteChannel.binary_symmetric_channel(p)
+        c = channel.bsc_capacity(p)
+        print(f"   Error probability p = {p:.2f}: Capacity = {c:.4f} bits")
+
+    # Monte Carlo check of the BSC
+    print("\n   Simulated BSC, p = 0.10, 10^7 bits:")
+    sim = ChannelSimulator.simulate_bsc(0.1, 10**7, seed=0)
+    print(f"   Error rate = {sim['error_rate']:.4f}, "
+          f"I(X;Y) = {sim['mutual_information']:.4f} bits (C = {sim['capacity']:.4f})")
+
+    # Shannon-Hartley
+    print("\n2. Gaussian Channel (Shannon-Hartley):")
+    print(f"   Telephone line (B=3000 Hz, SNR=30 dB):")
+    snr = ContinuousChannel.snr_from_db(30)
+    c = ContinuousChannel.shannon_hartley_capacity(3000, snr)
+    print(f"   Capacity = {c:.1f} bits/second")
+
+
+def demo_huffman_coding():
+    """Demonstrate Huffman coding."""
+    print("\n" + "="*70)
+    print("HUFFMAN CODING")
+    print("="*70)
+
+    # Example from Shannon's paper
+    probs = {'A': 0.5, 'B': 0.25, 'C': 0.125, 'D': 0.125}
+
+    print("\nSymbol probabilities:")
+    for sym, prob in probs.items():
+        print(f"   {sym}: {prob}")
+
+    # Calculate entropy
+    h = InformationTheory.entropy(list(probs.values()))
+    print(f"\nEntropy H = {h:.3f} bits per symbol")
+
+    # Generate Huffman code
+    code = SourceCoding.huffman_code(probs)
+    print("\nHuffman code:")
+    for sym in sorted(code.keys()):
+        print(f"   {sym}: {code[sym]}")
+
+    # Calculate average length
+    avg_len = SourceCoding.average_code_length(probs, code)
+    print(f"\nAverage code length L = {avg_len:.3f} bits per symbol")
+
+    efficiency = SourceCoding.coding_efficiency(probs, code)
+    print(f"Efficiency η = H/L = {efficiency:.3f} (100% = optimal)")
+
+    # Compress a message drawn from these probabilities
+    rng = np.random.default_rng(0)
+    message = rng.choice(list(b'ABCD'), size=100000, p=list(probs.values()))
+    data = bytes(message.astype(np.uint8))
+    codec = HuffmanCodec.from_data(data)
+    blob = codec.compress(data)
+    assert HuffmanCodec.decompress(blob) == data
+    print(f"\nCompressed {len(data)} bytes to {len(blob)} bytes "
+          f"({8 * len(blob) / len(data):.3f} bits per symbol)")
+
+
+def demo_text_analysis():
+    """Demonstrate text analysis."""
+    print("\n" + "="*70)
+    print("TEXT ANALYSIS")
+    print("="*70)
+
+    sample_text = """
+    The quick brown fox jumps over the lazy dog. 
+    This is a sample text for demonstrating Shannon's information theory.
+    """
+
+    # Letter frequencies
+    print("\nTop 10 letter frequencies:")
+    freqs = TextAnalysis.letter_frequencies(sample_text)
+    sorted_freqs = sorted(freqs.items(), key=lambda x: x[1], reverse=True)[:10]
+    for letter, freq in sorted_freqs:
+        if letter != ' ':
+            print(f"   {letter}: {freq:.4f}")
+
+    # Entropy calculations
+    print("\nEntropy analysis:")
+    h1 = TextAnalysis.text_entropy(sample_text, n=1)
+    print(f"   Unigram entropy: {h1:.3f} bits/letter")
+
+    h2 = TextAnalysis.text_entropy(sample_text, n=2)
+    print(f"   Bigram entropy: {h2:.3f} bits/letter")
+
+    # Redundancy
+    h_max = InformationTheory.max_entropy(27)  # 26 letters + space
+    redundancy = (h_max - h1) / h_max
+    print(f"   Redundancy: {redundancy:.1%}")
+    print(f"   (English typically has ~70-75% redundancy)")
+
+
+def main():
+    """Run all demonstrations (the `commtheory-demo` command)."""
+    print("\n" + "="*70)
+    print("SHANNON'S INFORMATION THEORY - DEMONSTRATION")
+    print("="*70)
+
+    # Run all demonstrations
+    demo_basic_entropy()
+    demo_channel_capacity()
+    demo_huffman_coding()
+    demo_text_analysis()
+
+    print("\n" + "="*70)
+    print("To create visualizations, run:")
+    print("  Visualization.plot_binary_entropy()")
+    print("  Visualization.plot_bsc_capacity()")
+    print("  Visualization.plot_shannon_hartley()")
+    print("="*70 + "\n")
+
+
+def entropy_main(argv: List[str] = None):
+    """Print the n-gram entropy of text files (the `commtheory-entropy` command)."""
+    parser = argparse.ArgumentParser(description='n-gram entropy of text files in bits per letter')
+    parser.add_argument('paths', nargs='+', help='text files to analyse')
+    parser.add_argument('-n', type=int, default=1, help='n-gram order (default: 1)')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        h = TextAnalysis.text_entropy_file(path, args.n, processes=args.processes)
+        print(f"{path}: {h:.4f} bits/letter")
+
+
+if __name__ == "__main__":
+    main()
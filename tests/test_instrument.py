@@ -0,0 +1,66 @@
+"""Tests for the opt-in instrumentation layer (commtheory.instrument)."""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from commtheory import instrument
+
+pytestmark = pytest.mark.skipif(not hasattr(tracemalloc, "reset_peak"),
+                                reason="memory tracking needs Python 3.9+")
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    instrument.disable()
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+@instrument.instrumented(name="inner")
+def inner():
+    return 1
+
+
+@instrument.instrumented(name="outer")
+def outer():
+    big = np.ones(10_000_000)  # 80 MB, freed before the nested call
+    del big
+    return inner()
+
+
+def test_nested_call_keeps_outer_peak():
+    with instrument.recording(memory=True):
+        outer()
+    snap = instrument.snapshot()
+    assert snap["outer"]["peak_alloc_bytes"] >= 80_000_000
+    assert snap["inner"]["peak_alloc_bytes"] < 1_000_000
+    assert snap["outer"]["calls"] == snap["inner"]["calls"] == 1
+
+
+def test_disable_and_recording_restore_tracing():
+    assert not tracemalloc.is_tracing()
+    instrument.enable(memory=True)
+    assert tracemalloc.is_tracing()
+    instrument.disable()
+    assert not tracemalloc.is_tracing()
+
+    with instrument.recording(memory=True):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        instrument.enable(memory=True)
+        instrument.disable()
+        assert tracemalloc.is_tracing()  # not ours to stop
+    finally:
+        tracemalloc.stop()
+
+
+def test_disabled_records_nothing():
+    outer()
+    assert instrument.snapshot() == {}
@@ -0,0 +1,180 @@
+"""Tests for the information theory toolkit (commtheory.mtc)."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from commtheory.mtc import (ChannelSimulator, DiscreteChannel, HuffmanCodec,
+                            SourceCoding, TextAnalysis)
+
+
+def bsc(p):
+    return np.array([[1 - p, p], [p, 1 - p]])
+
+
+def test_blahut_arimoto_closed_forms():
+    for p in (0.0, 0.01, 0.1, 0.3, 0.5):
+        c = DiscreteChannel(bsc(p)).capacity()
+        assert c == pytest.approx(DiscreteChannel(bsc(p)).bsc_capacity(p), abs=1e-6)
+
+    for e in (0.0, 0.2, 0.5, 0.9):
+        bec = np.array([[1 - e, e, 0.0], [0.0, e, 1 - e]])
+        assert DiscreteChannel(bec).capacity() == pytest.approx(1 - e, abs=1e-6)
+
+    for s in (0.1, 0.5, 0.9):
+        z = np.array([[1.0, 0.0], [s, 1 - s]])
+        closed = np.log2(1 + (1 - s) * s ** (s / (1 - s)))
+        assert DiscreteChannel(z).capacity() == pytest.approx(closed, abs=1e-6)
+
+
+def test_blahut_arimoto_batch_matches_single():
+    rng = np.random.default_rng(0)
+    w = rng.random((6, 8, 5))
+    w /= w.sum(axis=-1, keepdims=True)
+    c, p = DiscreteChannel.blahut_arimoto(w.reshape(2, 3, 8, 5))
+    assert c.shape == (2, 3) and p.shape == (2, 3, 8)
+    for i in range(6):
+        assert c.reshape(-1)[i] == pytest.approx(DiscreteChannel(w[i]).capacity(), abs=1e-9)
+
+
+def test_blahut_arimoto_mixed_stack_small_max_iter():
+    # identity channels converge on the first iteration, the random ones do not,
+    # so the working set is compacted on the last iteration
+    rng = np.random.default_rng(1)
+    noisy = rng.random((3, 50, 50))
+    noisy /= noisy.sum(axis=-1, keepdims=True)
+    w = np.concatenate([np.eye(50)[None].repeat(2, 0), noisy])
+    for max_iter in (1, 2, 5):
+        with pytest.warns(RuntimeWarning, match="3 of 5"):
+            c, p = DiscreteChannel.blahut_arimoto(w, max_iter=max_iter)
+        assert c[:2] == pytest.approx(np.log2(50))
+        assert np.all(c[2:] > 0)
+        assert p.sum(axis=1) == pytest.approx(np.ones(5))
+
+
+def test_blahut_arimoto_converged_stack_does_not_warn():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        DiscreteChannel.blahut_arimoto(np.stack([bsc(0.1), bsc(0.2)]))
+
+
+def test_blahut_arimoto_rejects_max_iter_zero():
+    with pytest.raises(ValueError):
+        DiscreteChannel.blahut_arimoto(bsc(0.1), max_iter=0)
+
+
+@pytest.mark.parametrize("p", [0.001, 0.05, 0.3, 0.5, 0.97, 0.999, 1 - 1e-11])
+def test_simulate_bsc_error_rate(p):
+    n = 200_003  # not a multiple of 64
+    result = ChannelSimulator.simulate_bsc(p, n, seed=3, chunk_bits=50_000)
+    assert result['n'] == n
+    assert result['joint_counts'].sum() == n
+    sigma = np.sqrt(p * (1 - p) / n)
+    assert abs(result['error_rate'] - p) <= 5 * sigma + 1e-9
+
+
+def test_simulate_bsc_reproducible_across_processes():
+    runs = [ChannelSimulator.simulate_bsc(0.1, 300_000, seed=7, processes=k, chunk_bits=64_000)
+            for k in (1, 2)]
+    assert np.array_equal(runs[0]['joint_counts'], runs[1]['joint_counts'])
+    other = ChannelSimulator.simulate_bsc(0.1, 300_000, seed=8, chunk_bits=64_000)
+    assert not np.array_equal(runs[0]['joint_counts'], other['joint_counts'])
+
+
+def test_simulate_general_channel_reproducible_across_processes():
+    channel = DiscreteChannel(np.array([[0.8, 0.1, 0.1], [0.2, 0.7, 0.1], [0.0, 0.5, 0.5]]))
+    runs = [ChannelSimulator.simulate(channel, 100_000, seed=5, processes=k, chunk_symbols=30_000)
+            for k in (1, 2)]
+    assert np.array_equal(runs[0]['joint_counts'], runs[1]['joint_counts'])
+    assert runs[0]['error_rate'] == pytest.approx((0.2 + 0.3 + 0.5) / 3, abs=0.01)
+
+
+def test_simulate_rejects_empty_runs():
+    with pytest.raises(ValueError):
+        ChannelSimulator.simulate_bsc(0.1, 0)
+    with pytest.raises(ValueError):
+        ChannelSimulator.simulate(DiscreteChannel(bsc(0.1)), 0)
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    rng = np.random.default_rng(11)
+    # letters, spaces, plus digits and punctuation that both counters drop
+    text = ''.join(rng.choice(list("abcdeABCDE    xyz.,;19"), size=3000))
+    path = tmp_path / "text.txt"
+    path.write_text(text)
+    return text, str(path)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 6])
+@pytest.mark.parametrize("chunk_size,processes", [(1, 1), (2, 1), (7, 1), (7, 3), (64, 4), (1 << 16, 1)])
+def test_ngram_frequencies_file_matches_in_memory(text_file, n, chunk_size, processes):
+    text, path = text_file
+    expected = TextAnalysis.ngram_frequencies(text, n, normalize=False)
+    counted = TextAnalysis.ngram_frequencies_file(path, n, normalize=False,
+                                                  chunk_size=chunk_size, processes=processes)
+    assert counted == expected
+
+
+def fibonacci_skewed():
+    # byte i occurs fib(i) times: the unrestricted Huffman code is 24 bits deep
+    fib = [1, 1]
+    while len(fib) < 25:
+        fib.append(fib[-1] + fib[-2])
+    rng = np.random.default_rng(2)
+    data = np.repeat(np.arange(25, dtype=np.uint8), fib)
+    return rng.permutation(data).tobytes()
+
+
+def huffman_inputs():
+    rng = np.random.default_rng(4)
+    return {
+        "empty": b"",
+        "one byte": b"x",
+        "single symbol": b"a" * 10_000,
+        "all 256 symbols": bytes(range(256)) * 3,
+        "random": rng.integers(0, 256, 50_000, dtype=np.uint8).tobytes(),
+        "skewed": rng.geometric(0.3, 50_000).clip(0, 255).astype(np.uint8).tobytes(),
+        "fibonacci": fibonacci_skewed(),
+        "block boundary": rng.integers(0, 7, HuffmanCodec.BLOCK_SYMBOLS + 1, dtype=np.uint8).tobytes(),
+    }
+
+
+@pytest.mark.parametrize("name", list(huffman_inputs()))
+def test_huffman_codec_round_trip(name):
+    data = huffman_inputs()[name]
+    codec = HuffmanCodec.from_data(data)
+    assert HuffmanCodec.decompress(codec.compress(data)) == data
+    payload, offsets = codec.encode(data)
+    assert codec.decode(payload, len(data), offsets) == data
+
+
+def test_huffman_codec_length_limit_rescales_counts():
+    data = fibonacci_skewed()
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8))
+    unlimited = SourceCoding.huffman_code_lengths(dict(enumerate(counts.tolist())))
+    assert max(unlimited.values()) > HuffmanCodec.TABLE_BITS
+
+    codec = HuffmanCodec.from_data(data)
+    lengths = codec.lengths[codec.lengths > 0].astype(int)
+    assert len(lengths) == 25
+    assert lengths.max() == HuffmanCodec.TABLE_BITS
+    assert np.sum(2.0 ** -lengths) == pytest.approx(1.0)  # complete prefix code
+
+
+@pytest.mark.parametrize("extra", [-1, 0, 1, 2])
+def test_huffman_codec_block_boundaries(extra):
+    rng = np.random.default_rng(5)
+    n = 2 * HuffmanCodec.BLOCK_SYMBOLS + extra
+    data = rng.geometric(0.2, n).clip(0, 255).astype(np.uint8).tobytes()
+    codec = HuffmanCodec.from_data(data)
+    _, offsets = codec.encode(data)
+    assert len(offsets) == -(-n // HuffmanCodec.BLOCK_SYMBOLS)
+    assert HuffmanCodec.decompress(codec.compress(data)) == data
+
+
+def test_huffman_codec_rejects_uncovered_bytes():
+    codec = HuffmanCodec.from_data(b"abc")
+    with pytest.raises(ValueError):
+        codec.encode(b"abd")